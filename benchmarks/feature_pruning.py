@@ -0,0 +1,65 @@
+"""Feature computation and prediction time before and after feature pruning
+
+Run from the project root:
+    python -m benchmarks.feature_pruning
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import FeatureEngineer
+from src.models import TradingModel
+
+
+def make_market_data(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return pd.DataFrame({
+        'date': pd.date_range('2000-01-01', periods=n_bars, freq='min'),
+        'open': close * (1 + rng.normal(0, 0.002, n_bars)),
+        'high': close * 1.005,
+        'low': close * 0.995,
+        'close': close,
+        'volume': rng.integers(10**5, 10**6, n_bars).astype(float)
+    })
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    df = make_market_data(200_000)
+    feature_engineer = FeatureEngineer()
+    config = {'model': {'n_estimators': 100, 'max_depth': 10, 'n_jobs': -1,
+                        'feature_selection': {'enabled': True}}}
+
+    features = feature_engineer.calculate_technical_indicators(df)
+    full_model = TradingModel({'model': {**config['model'], 'feature_selection': {}}})
+    X, y = full_model.prepare_data(features)
+    full_model.train(X, y)
+
+    pruned_model = TradingModel(config)
+    pruned_model.train(X, y)
+    selected = pruned_model.feature_columns
+    print(f"Kept {len(selected)} of {X.shape[1]} features: {selected}")
+
+    full_compute = best_of(lambda: feature_engineer.calculate_technical_indicators(df))
+    pruned_compute = best_of(
+        lambda: feature_engineer.calculate_technical_indicators(df, selected))
+    full_predict = best_of(lambda: full_model.predict(X), repeat=3)
+    pruned_predict = best_of(lambda: pruned_model.predict(X), repeat=3)
+
+    print(f"feature computation: {full_compute:.3f}s -> {pruned_compute:.3f}s "
+          f"({pruned_compute / full_compute:.0%} of original)")
+    print(f"prediction:          {full_predict:.3f}s -> {pruned_predict:.3f}s "
+          f"({pruned_predict / full_predict:.0%} of original)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Scaling of parallel feature generation across cores
+
+Run from the project root:
+    python -m benchmarks.feature_scaling
+"""
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import FeatureEngineer
+from src.parallel_features import ParallelFeatureExecutor
+
+
+def make_universe(n_symbols: int, n_bars: int, seed: int = 0) -> dict:
+    """Synthetic random-walk OHLCV frames"""
+    rng = np.random.default_rng(seed)
+    universe = {}
+    for i in range(n_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+        universe[f'SYM{i:04d}'] = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.002, n_bars)),
+            'high': close * 1.01,
+            'low': close * 0.99,
+            'close': close,
+            'volume': rng.integers(10**5, 10**6, n_bars).astype(float)
+        })
+    return universe
+
+
+def main():
+    universe = make_universe(n_symbols=200, n_bars=5000)
+    feature_engineer = FeatureEngineer()
+
+    start = time.perf_counter()
+    for df in universe.values():
+        feature_engineer.calculate_technical_indicators(df)
+    serial = time.perf_counter() - start
+    print(f"serial loop: {serial:.3f}s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        executor = ParallelFeatureExecutor(max_workers=workers)
+        start = time.perf_counter()
+        executor.calculate_universe(universe)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {elapsed:.3f}s  speedup {serial / elapsed:.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
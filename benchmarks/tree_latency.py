@@ -0,0 +1,52 @@
+"""Single-row prediction latency: compiled FlatForest vs model.predict
+
+Run from the project root:
+    python -m benchmarks.tree_latency
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from src.models import TradingModel
+
+
+def time_call(func, arg, repeat: int) -> float:
+    """Median latency of func(arg) in microseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e6)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(20000, 12)),
+                     columns=[f'f{i}' for i in range(12)])
+    y = pd.Series((X['f0'] + X['f1'] * X['f2'] +
+                   rng.normal(size=len(X)) > 0).astype(int))
+
+    trading_model = TradingModel(
+        {'model': {'n_estimators': 100, 'max_depth': 10}})
+    trading_model.train(X, y)
+    compiled = trading_model.compile()
+
+    X_test = rng.normal(size=(5000, 12))
+    X_test[::50, 3] = np.nan
+    assert np.array_equal(compiled.predict(X_test),
+                          trading_model.predict(pd.DataFrame(X_test, columns=X.columns)))
+    print("FlatForest predictions match model.predict")
+
+    for batch in [1, 16, 256]:
+        rows = X_test[:batch]
+        frame = pd.DataFrame(rows, columns=X.columns)
+        sklearn_us = time_call(trading_model.predict, frame, 50)
+        compiled_us = time_call(compiled.predict, rows, 200)
+        print(f"batch {batch:>4}: model.predict {sklearn_us:9.1f}us  "
+              f"FlatForest {compiled_us:8.1f}us  "
+              f"speedup {sklearn_us / compiled_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
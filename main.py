@@ -8,8 +8,9 @@ from src.risk_manager import RiskManager
 def main():
     # Initialize components
     data_loader = DataLoader()
-    feature_engineer = FeatureEngineer()
-    trading_model = TradingModel()
+    config = data_loader.config
+    feature_engineer = FeatureEngineer(config)
+    trading_model = TradingModel(config)
 
     # Load and process data
     df = data_loader.load_market_data("market_data.csv")
@@ -24,11 +25,10 @@ def main():
     X, y = trading_model.prepare_data(df)
     trading_model.train(X, y)
 
-    # Make predictions
-    predictions = trading_model.predict(X)
+    # Make predictions for every bar, including the unlabeled last ones
+    predictions = trading_model.predict(df[X.columns])
 
     # Run backtest
-    config = data_loader.config  # Reuse the loaded config
     backtester = Backtester(config)
     results = backtester.run(df, predictions)
 
@@ -1,29 +1,224 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional, Sequence, Tuple, Union
 
 
 class FeatureEngineer:
     """Feature engineering for market data"""
 
+    MA_WINDOWS = [5, 10, 20, 50]
+    RSI_PERIOD = 14
+    ORDER_STAT_WINDOWS = [20, 252]
+    ORDER_STAT_QUANTILES = [0.1, 0.9]
+    # Bars after which the seed of the MACD EWMs has decayed below ~1e-10
+    EWM_WARMUP = 300
+
     def __init__(self, config: Dict = None):
         self.config = config or {}
 
-    def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate technical indicators for market data"""
-        df = df.copy()
+    @property
+    def max_lookback(self) -> int:
+        """Bars of history needed before every indicator has settled"""
+        return max(max(self.MA_WINDOWS), self.RSI_PERIOD + 1, self.EWM_WARMUP)
+
+    def calculate_technical_indicators(self, df: pd.DataFrame,
+                                       columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Calculate technical indicators for market data
+
+        Args:
+            df: Market data
+            columns: Only compute and return these columns (e.g. a trained
+                model's feature_columns); all columns by default
+        """
+        return self.lazy_technical_indicators(df).to_frame(columns)
+
+    def lazy_technical_indicators(self, df: pd.DataFrame) -> 'LazyFeatureFrame':
+        """Register technical indicators without computing them yet"""
+        features = LazyFeatureFrame(df)
 
         # Moving averages
-        for window in [5, 10, 20, 50]:
-            df[f'MA_{window}'] = df['close'].rolling(window=window).mean()
+        for window in self.MA_WINDOWS:
+            features.register(
+                f'MA_{window}',
+                lambda f, window=window: f['close'].rolling(window=window).mean())
 
         # RSI
-        df['RSI'] = self._calculate_rsi(df['close'])
+        features.register(
+            'RSI', lambda f: self._calculate_rsi(f['close'], self.RSI_PERIOD))
 
         # MACD
-        df = self._calculate_macd(df)
+        features.register('MACD', lambda f: self._macd_lines(f['close'])[0])
+        features.register(
+            'Signal_Line', lambda f: f['MACD'].ewm(span=9, adjust=False).mean())
+
+        return features
+
+    def calculate_order_statistics(self, df: pd.DataFrame,
+                                   windows: Optional[Sequence[int]] = None,
+                                   quantiles: Optional[Sequence[float]] = None,
+                                   columns: Sequence[str] = ('close', 'volume')) -> pd.DataFrame:
+        """
+        Calculate rolling median, quantiles and percent rank
+
+        Uses pandas' skiplist-backed rolling kernels, which update the sorted
+        window in O(log w) per bar instead of re-sorting it as
+        rolling().apply would.
+
+        Args:
+            df: Market data
+            windows: Rolling window lengths (defaults to the
+                features.order_statistics config, then ORDER_STAT_WINDOWS)
+            quantiles: Quantile levels in (0, 1)
+            columns: Columns to compute statistics for; missing ones are skipped
+
+        Returns:
+            Copy of df with `{col}_median_{w}`, `{col}_q{pct}_{w}` and
+            `{col}_pct_rank_{w}` columns added
+        """
+        features = LazyFeatureFrame(df)
+        self.register_order_statistics(features, windows, quantiles, columns)
+        return features.to_frame()
+
+    def register_order_statistics(self, features: 'LazyFeatureFrame',
+                                  windows: Optional[Sequence[int]] = None,
+                                  quantiles: Optional[Sequence[float]] = None,
+                                  columns: Sequence[str] = ('close', 'volume')) -> None:
+        """Register rolling order statistics on a lazy feature frame"""
+        settings = self.config.get('features', {}).get('order_statistics', {})
+        windows = windows or settings.get('windows', self.ORDER_STAT_WINDOWS)
+        quantiles = quantiles or settings.get(
+            'quantiles', self.ORDER_STAT_QUANTILES)
+
+        for col in columns:
+            if col not in features:
+                continue
+            for window in windows:
+                features.register(
+                    f'{col}_median_{window}',
+                    lambda f, col=col, window=window:
+                        f[col].rolling(window=window).median())
+                for q in quantiles:
+                    features.register(
+                        f'{col}_q{round(q * 100):g}_{window}',
+                        lambda f, col=col, window=window, q=q:
+                            f[col].rolling(window=window).quantile(q))
+                features.register(
+                    f'{col}_pct_rank_{window}',
+                    lambda f, col=col, window=window:
+                        f[col].rolling(window=window).rank(pct=True))
+
+    def fractional_diff(self, prices: pd.Series, d: float = 0.4,
+                        threshold: float = 1e-4,
+                        chunk_size: int = 1 << 16) -> pd.Series:
+        """
+        Fixed-width fractional differencing of a price series
+
+        Weights are computed once per (d, threshold) and cached; the weighted
+        sum is applied with overlap-save FFT convolution over fixed-size
+        blocks, so cost is O(n log w) and memory is bounded by chunk_size
+        regardless of series length.
+
+        Args:
+            prices: Price series (NaNs are skipped and left as NaN)
+            d: Differencing order, typically between 0 and 1
+            threshold: Weights smaller than this in magnitude are dropped,
+                which sets the window width
+            chunk_size: FFT block length; raised to fit the window if needed
+
+        Returns:
+            Series aligned with prices; the first width - 1 values are NaN
+        """
+        weights = _fractional_diff_weights(d, threshold)
+        values = prices.dropna().to_numpy(dtype=float)
+        result = np.full(len(values), np.nan)
+
+        width = len(weights)
+        if len(values) >= width:
+            result[width - 1:] = _overlap_save(values, weights, chunk_size)
+
+        return pd.Series(result, index=prices.dropna().index,
+                         name=prices.name).reindex(prices.index)
+
+    def register_fractional_diff(self, features: 'LazyFeatureFrame',
+                                 orders: Sequence[float] = (0.4,),
+                                 column: str = 'close',
+                                 threshold: float = 1e-4) -> None:
+        """Register `{column}_fracdiff_{d}` columns on a lazy feature frame"""
+        for d in orders:
+            features.register(
+                f'{column}_fracdiff_{d:g}',
+                lambda f, d=d: self.fractional_diff(f[column], d, threshold))
+
+    def calculate_panel_indicators(self,
+                                   close: Union[pd.DataFrame, np.ndarray],
+                                   volume: Optional[Union[pd.DataFrame, np.ndarray]] = None,
+                                   symbols: Optional[Sequence[str]] = None,
+                                   index: Optional[pd.Index] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Calculate technical indicators for many symbols at once
+
+        Every indicator is computed column-wise over the whole
+        (time x symbols) panel in a single vectorized call, so the per-symbol
+        overhead of calling calculate_technical_indicators in a loop goes away.
+
+        Args:
+            close: Close prices, shape (time, symbols)
+            volume: Optional volumes with the same shape as close
+            symbols: Column labels when close is a plain array
+            index: Row labels when close is a plain array
+
+        Returns:
+            Dict mapping feature name to a (time x symbols) DataFrame, in the
+            same column order as calculate_technical_indicators
+        """
+        close = self._as_panel(close, symbols, index)
+
+        panel = {'close': close}
+        if volume is not None:
+            panel['volume'] = self._as_panel(
+                volume, close.columns, close.index)
+
+        for window in self.MA_WINDOWS:
+            panel[f'MA_{window}'] = close.rolling(window=window).mean()
+
+        panel['RSI'] = self._calculate_rsi(close, self.RSI_PERIOD)
+        panel['MACD'], panel['Signal_Line'] = self._macd_lines(close)
+
+        return panel
+
+    def panel_to_array(self, panel: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, List[str]]:
+        """Stack a feature panel into a (time, symbols, features) block"""
+        names = list(panel)
+        block = np.stack([panel[name].to_numpy(dtype=float)
+                          for name in names], axis=-1)
+        return block, names
 
-        return df
+    def panel_to_long(self, panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Convert a feature panel into a long frame indexed by (date, symbol)"""
+        block, names = self.panel_to_array(panel)
+        first = next(iter(panel.values()))
+        n_rows, n_symbols = first.shape
+
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(first.index.to_numpy(), n_symbols),
+             np.tile(first.columns.to_numpy(), n_rows)],
+            names=['date', 'symbol'])
+
+        return pd.DataFrame(block.reshape(n_rows * n_symbols, len(names)),
+                            index=index, columns=names)
+
+    def _as_panel(self, values, columns=None, index=None) -> pd.DataFrame:
+        """Wrap a 2-D array in a (time x symbols) DataFrame"""
+        if isinstance(values, pd.DataFrame):
+            return values.astype(float)
+
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError(
+                f"Panel inputs must be 2-D (time x symbols), got shape {values.shape}")
+        return pd.DataFrame(values, index=index, columns=columns)
 
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """Calculate Relative Strength Index"""
@@ -35,12 +230,113 @@ class FeatureEngineer:
         rsi = 100 - (100 / (1 + rs))
         return rsi
 
-    def _calculate_macd(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate MACD indicator"""
-        exp1 = df['close'].ewm(span=12, adjust=False).mean()
-        exp2 = df['close'].ewm(span=26, adjust=False).mean()
+    def _macd_lines(self, prices):
+        """Calculate MACD and signal lines for a Series or a panel"""
+        exp1 = prices.ewm(span=12, adjust=False).mean()
+        exp2 = prices.ewm(span=26, adjust=False).mean()
+
+        macd = exp1 - exp2
+        signal_line = macd.ewm(span=9, adjust=False).mean()
+
+        return macd, signal_line
+
+
+@lru_cache(maxsize=64)
+def _fractional_diff_weights(d: float, threshold: float,
+                             max_width: int = 100_000) -> np.ndarray:
+    """Fractional differencing weights w_k, most recent observation first"""
+    weights = [1.0]
+    for k in range(1, max_width):
+        w = -weights[-1] * (d - k + 1) / k
+        if abs(w) < threshold:
+            break
+        weights.append(w)
+
+    weights = np.array(weights)
+    weights.flags.writeable = False
+    return weights
+
+
+def _overlap_save(values: np.ndarray, weights: np.ndarray,
+                  block_size: int) -> np.ndarray:
+    """Valid part of the convolution of values with weights, block by block"""
+    width = len(weights)
+    n_fft = 1 << int(np.ceil(np.log2(max(block_size, 2 * width))))
+    step = n_fft - width + 1
+    weights_fft = np.fft.rfft(weights, n_fft)
+
+    n_out = len(values) - width + 1
+    out = np.empty(n_out)
+    for start in range(0, n_out, step):
+        segment = values[start:start + n_fft]
+        block = np.fft.irfft(np.fft.rfft(segment, n_fft) * weights_fft, n_fft)
+        stop = min(start + step, n_out)
+        out[start:stop] = block[width - 1:width - 1 + stop - start]
+
+    return out
+
+
+class LazyFeatureFrame:
+    """Feature container that computes indicator columns on first access"""
+
+    def __init__(self, df: pd.DataFrame):
+        self._base = df
+        self._definitions: Dict[str, Callable[['LazyFeatureFrame'], pd.Series]] = {}
+        self._cache: Dict[str, pd.Series] = {}
+
+    def register(self, name: str,
+                 func: Callable[['LazyFeatureFrame'], pd.Series]) -> None:
+        """
+        Register an indicator definition
+
+        Args:
+            name: Column name of the indicator
+            func: Called with this frame on first access; may read other
+                columns, including other lazy indicators
+        """
+        self._definitions[name] = func
+        self._cache.pop(name, None)
+
+    @property
+    def index(self) -> pd.Index:
+        return self._base.index
+
+    @property
+    def columns(self) -> List[str]:
+        """Base columns followed by registered indicators"""
+        base = [col for col in self._base.columns if col not in self._definitions]
+        return base + list(self._definitions)
+
+    def is_computed(self, name: str) -> bool:
+        """Check whether an indicator has already been materialized"""
+        return name in self._cache
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._definitions or name in self._base.columns
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    def __getitem__(self, key):
+        if isinstance(key, list):
+            return self.to_frame(key)
+
+        if key in self._definitions:
+            if key not in self._cache:
+                self._cache[key] = self._definitions[key](self)
+            return self._cache[key]
+
+        return self._base[key]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Materialize the requested columns (all by default) as a DataFrame"""
+        columns = self.columns if columns is None else columns
 
-        df['MACD'] = exp1 - exp2
-        df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
+        df = self._base[[col for col in columns
+                         if col in self._base.columns
+                         and col not in self._definitions]].copy()
+        for col in columns:
+            if col in self._definitions:
+                df[col] = self[col]
 
-        return df
+        return df[columns]
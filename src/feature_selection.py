@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from sklearn.inspection import permutation_importance
+from typing import Any, Dict, List, Optional
+
+
+class FeatureSelector:
+    """Importance-driven feature pruning
+
+    Features are ranked by impurity importance (from a fitted tree
+    ensemble) or permutation importance; models without impurity
+    importances fall back to permutation importance. Features whose normalized
+    importance is below min_importance are dropped, and of any pair
+    correlated above max_correlation only the more important one is kept.
+    """
+
+    def __init__(self, method: str = 'impurity', min_importance: float = 0.01,
+                 max_correlation: float = 0.95, n_repeats: int = 5,
+                 random_state: Optional[int] = 42):
+        if method not in ('impurity', 'permutation'):
+            raise ValueError(f"Unsupported importance method: {method}")
+        self.method = method
+        self.min_importance = min_importance
+        self.max_correlation = max_correlation
+        self.n_repeats = n_repeats
+        self.random_state = random_state
+
+        self.importances_: Optional[pd.Series] = None
+        self.selected_: List[str] = []
+        self.dropped_: Dict[str, str] = {}
+
+    def fit(self, model: Any, X: pd.DataFrame, y: pd.Series) -> 'FeatureSelector':
+        """
+        Rank features and choose the subset to keep
+
+        Args:
+            model: Estimator already fitted on X's columns
+            X: Feature matrix used for correlations (and permutation scoring)
+            y: Target vector (used by permutation importance)
+        """
+        self.importances_ = self._importances(model, X, y)
+        ranked = self.importances_.sort_values(ascending=False)
+        correlation = X[ranked.index].corr().abs()
+
+        self.selected_ = []
+        self.dropped_ = {}
+        for rank, (feature, importance) in enumerate(ranked.items()):
+            # The top-ranked feature is always kept
+            if rank > 0 and importance < self.min_importance:
+                self.dropped_[feature] = f'importance {importance:.4f}'
+                continue
+
+            redundant_with = next(
+                (kept for kept in self.selected_
+                 if correlation.loc[feature, kept] > self.max_correlation), None)
+            if redundant_with is not None:
+                self.dropped_[feature] = f'correlated with {redundant_with}'
+                continue
+
+            self.selected_.append(feature)
+
+        # Keep the original column order for downstream consumers
+        self.selected_ = [col for col in X.columns if col in self.selected_]
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Keep only the selected features"""
+        return X[self.selected_]
+
+    def _importances(self, model: Any, X: pd.DataFrame, y: pd.Series) -> pd.Series:
+        if self.method == 'impurity' and hasattr(model, 'feature_importances_'):
+            importances = np.asarray(model.feature_importances_, dtype=float)
+        else:
+            if self.method == 'impurity':
+                print(f"{type(model).__name__} has no impurity importances; "
+                      "using permutation importance")
+            result = permutation_importance(
+                model, X, y, n_repeats=self.n_repeats,
+                random_state=self.random_state)
+            importances = np.clip(result.importances_mean, 0, None)
+
+        total = importances.sum()
+        if total > 0:
+            importances = importances / total
+        return pd.Series(importances, index=X.columns)
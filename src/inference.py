@@ -0,0 +1,202 @@
+import time
+import queue
+import asyncio
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def _n_rows(X) -> int:
+    """Row count of a DataFrame, a 2-D array or a single 1-D row"""
+    return len(X) if isinstance(X, pd.DataFrame) else len(np.atleast_2d(X))
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram"""
+
+    def __init__(self, edges: Sequence[float]):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        bucket = int(np.searchsorted(self.edges, value, side='left'))
+        with self._lock:
+            self.counts[bucket] += 1
+            self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts per bucket keyed by upper edge ('inf' for the overflow bucket)"""
+        with self._lock:
+            counts = self.counts.copy()
+            total = self.total
+        labels = [f'{edge:g}' for edge in self.edges] + ['inf']
+        n = int(counts.sum())
+        return {
+            'count': n,
+            'mean': total / n if n else 0.0,
+            'buckets': dict(zip(labels, counts.tolist()))
+        }
+
+
+class BatchingPredictor:
+    """In-process micro-batching queue in front of a TradingModel
+
+    Callers submit small inputs from any thread (or await them from
+    asyncio); a background thread gathers requests for up to max_wait_ms or
+    max_batch_rows rows, runs one vectorized predict_proba and hands each
+    caller back its own rows.
+
+    DataFrames are matched to trading_model.feature_columns by name; raw
+    arrays must already be in that column order. With feature selection
+    enabled those are the pruned columns, not everything FeatureEngineer
+    produces. Inputs of the wrong shape are rejected by submit(), and if a
+    batch still fails its requests are retried one at a time, so only the
+    offending caller gets the exception.
+    """
+
+    BATCH_SIZE_EDGES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+    LATENCY_EDGES_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250]
+
+    def __init__(self, trading_model: Any, max_batch_rows: int = 256,
+                 max_wait_ms: float = 2.0):
+        self.trading_model = trading_model
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+
+        self.batch_sizes = Histogram(self.BATCH_SIZE_EDGES)
+        self.latency_ms = Histogram(self.LATENCY_EDGES_MS)
+
+        self._queue: 'queue.Queue[Optional[Tuple[Any, Future, float]]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'BatchingPredictor':
+        """Start the batching thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name='batching-predictor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Finish queued requests and stop the batching thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'BatchingPredictor':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting to be batched"""
+        return self._queue.qsize()
+
+    def submit(self, X) -> Future:
+        """Queue rows for prediction; the future resolves to their probabilities"""
+        if self._thread is None:
+            raise RuntimeError("BatchingPredictor is not running; call start()")
+        self._check_input(X)
+        future: Future = Future()
+        self._queue.put((X, future, time.perf_counter()))
+        return future
+
+    def predict_proba(self, X, timeout: Optional[float] = None) -> np.ndarray:
+        """Blocking prediction through the batching queue"""
+        return self.submit(X).result(timeout)
+
+    async def predict_proba_async(self, X) -> np.ndarray:
+        """Awaitable prediction through the batching queue"""
+        return await asyncio.wrap_future(self.submit(X))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth plus batch size and latency histograms"""
+        return {
+            'queue_depth': self.queue_depth,
+            'batch_size': self.batch_sizes.snapshot(),
+            'latency_ms': self.latency_ms.snapshot()
+        }
+
+    def _check_input(self, X) -> None:
+        """Reject inputs that could not be stacked with other requests"""
+        columns = getattr(self.trading_model, 'feature_columns', None)
+        if isinstance(X, pd.DataFrame):
+            missing = [col for col in columns or [] if col not in X.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns: {missing}")
+            return
+
+        values = np.asarray(X, dtype=float)
+        if values.ndim not in (1, 2):
+            raise ValueError(
+                f"Expected a row or a 2-D array of rows, got shape {values.shape}")
+        if columns is not None and values.shape[-1] != len(columns):
+            raise ValueError(f"Expected {len(columns)} features in feature_columns "
+                             f"order, got {values.shape[-1]}")
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            batch = [request]
+            rows = _n_rows(request[0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                rows += _n_rows(request[0])
+
+            self._predict_batch(batch)
+
+    def _predict_batch(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        # Drop requests whose callers cancelled while they were queued
+        batch = [request for request in batch
+                 if request[1].set_running_or_notify_cancel()]
+        if batch:
+            self._predict_requests(batch)
+
+    def _predict_requests(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        try:
+            columns = getattr(self.trading_model, 'feature_columns', None) or next(
+                (x.columns for x, _, _ in batch if isinstance(x, pd.DataFrame)), None)
+            X = np.vstack([
+                np.atleast_2d(np.asarray(
+                    x[columns] if isinstance(x, pd.DataFrame) else x, dtype=float))
+                for x, _, _ in batch])
+            if columns is not None:
+                X = pd.DataFrame(X, columns=columns)
+            proba = self.trading_model.predict_proba(X)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                # Retry one request at a time so only the bad ones fail
+                for request in batch:
+                    self._predict_requests([request])
+            return
+
+        self.batch_sizes.record(len(X))
+        offsets = np.cumsum([_n_rows(x) for x, _, _ in batch])[:-1]
+        done = time.perf_counter()
+        for (_, future, submitted), result in zip(batch, np.split(proba, offsets)):
+            future.set_result(result)
+            self.latency_ms.record((done - submitted) * 1000)
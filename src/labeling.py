@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Optional
+
+TAKE_PROFIT = 1
+STOP_LOSS = -1
+TIME_LIMIT = 0
+
+
+def triple_barrier_labels(close: pd.Series,
+                          take_profit: float,
+                          stop_loss: float,
+                          max_holding: int,
+                          high: Optional[pd.Series] = None,
+                          low: Optional[pd.Series] = None,
+                          chunk_size: int = 100_000) -> pd.DataFrame:
+    """
+    Label every bar by the first barrier a long entry at its close touches
+
+    For all bars at once, the next max_holding prices are viewed as a
+    (bars x max_holding) window matrix without copying, and the first
+    take-profit and stop-loss crossings are found with argmax over boolean
+    hit masks. Rows are processed in chunks so memory stays bounded.
+
+    Args:
+        close: Close prices; entries and exits happen at the close
+        take_profit: Fractional gain that closes the trade (e.g. 0.05)
+        stop_loss: Fractional loss that closes the trade (e.g. 0.02)
+        max_holding: Bars after which the trade is closed regardless
+        high: Optional highs for intrabar take-profit detection
+            (defaults to close, matching Backtester)
+        low: Optional lows for intrabar stop-loss detection
+        chunk_size: Entries processed per vectorized step
+
+    Returns:
+        DataFrame indexed like close with
+            label: 1 take-profit first, -1 stop-loss first (also when both
+                are touched in the same bar), 0 time limit, NaN for the last
+                max_holding bars, whose look-ahead window is incomplete
+            exit_offset: Bars from entry to exit
+            exit_return: Close-to-close return of the trade
+        Bars near the end with fewer than max_holding bars ahead exit at the
+        last available bar if no barrier is touched.
+    """
+    prices = close.to_numpy(dtype=float)
+    highs = prices if high is None else high.to_numpy(dtype=float)
+    lows = prices if low is None else low.to_numpy(dtype=float)
+
+    n = len(prices)
+    pad = np.full(max_holding, np.nan)
+    # Row i holds bars i+1 .. i+max_holding; NaN padding never triggers a hit
+    high_windows = sliding_window_view(np.concatenate([highs[1:], pad, [np.nan]]),
+                                       max_holding)[:n]
+    low_windows = sliding_window_view(np.concatenate([lows[1:], pad, [np.nan]]),
+                                      max_holding)[:n]
+
+    labels = np.empty(n, dtype=float)
+    exit_offset = np.empty(n, dtype=np.int64)
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        entry = prices[start:stop, None]
+
+        # Same return arithmetic as Backtester._find_exit_point
+        tp_hit = (high_windows[start:stop] - entry) / entry >= take_profit
+        sl_hit = (low_windows[start:stop] - entry) / entry <= -stop_loss
+
+        first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), max_holding)
+        first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), max_holding)
+        first_hit = np.minimum(first_tp, first_sl)
+
+        remaining = n - 1 - np.arange(start, stop)
+        labels[start:stop] = np.where(
+            remaining < max_holding, np.nan,
+            np.where(first_hit == max_holding, TIME_LIMIT,
+                     np.where(first_sl <= first_tp, STOP_LOSS, TAKE_PROFIT)))
+
+        exit_offset[start:stop] = np.where(
+            first_hit < max_holding, first_hit + 1,
+            np.minimum(max_holding, remaining))
+
+    exit_index = np.arange(n) + exit_offset
+    exit_return = prices[exit_index] / prices - 1
+
+    return pd.DataFrame({
+        'label': labels,
+        'exit_offset': exit_offset,
+        'exit_return': exit_return
+    }, index=close.index)
+
+
+def triple_barrier_labels_from_config(df: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """
+    Triple-barrier labels using the backtest's stop-loss and take-profit
+
+    Barriers come from the backtest section so the model learns the exits
+    Backtester actually trades; the time limit is labeling.max_holding.
+    Highs and lows are used only when labeling.use_high_low is set.
+    """
+    backtest_config = config.get('backtest', {})
+    labeling_config = config.get('labeling', {})
+    use_high_low = labeling_config.get('use_high_low', False)
+
+    return triple_barrier_labels(
+        df['close'],
+        take_profit=backtest_config.get('take_profit', 0.05),
+        stop_loss=backtest_config.get('stop_loss', 0.02),
+        max_holding=labeling_config.get('max_holding', 20),
+        high=df['high'] if use_high_low and 'high' in df else None,
+        low=df['low'] if use_high_low and 'low' in df else None
+    )
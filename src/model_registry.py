@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+import joblib
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def fingerprint_training_run(X: pd.DataFrame, y: pd.Series, model: Any,
+                             parent: Optional[str] = None,
+                             selection: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Fingerprint a training run from its data, feature columns and hyperparameters
+
+    Args:
+        X: Feature matrix
+        y: Target vector
+        model: Unfitted estimator whose class and get_params() are hashed
+        parent: Fingerprint of the model this run updates incrementally
+        selection: model.feature_selection config; only hashed when enabled
+
+    Returns:
+        Hex digest identifying the run
+    """
+    digest = hashlib.sha256()
+    if parent is not None:
+        digest.update(parent.encode())
+    digest.update(json.dumps([str(col) for col in X.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    # Parallelism and logging settings do not change the fitted model
+    params = {key: value for key, value in model.get_params().items()
+              if key not in ('n_jobs', 'verbose')}
+    digest.update(type(model).__name__.encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    if selection and selection.get('enabled', False):
+        digest.update(json.dumps(selection, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """On-disk store of trained model artifacts keyed by fingerprint"""
+
+    INDEX_FILE = 'registry.json'
+
+    def __init__(self, path: str = 'models'):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+        self.index_path = os.path.join(self.path, self.INDEX_FILE)
+
+    def contains(self, fingerprint: str) -> bool:
+        """Check whether an artifact exists for a fingerprint"""
+        entry = self._read_index().get(fingerprint)
+        return entry is not None and os.path.exists(
+            os.path.join(self.path, entry['file']))
+
+    def load(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an artifact with its arrays memory-mapped read-only
+
+        Returns:
+            The saved payload (model plus metadata), or None if missing
+        """
+        if not self.contains(fingerprint):
+            return None
+        entry = self._read_index()[fingerprint]
+        return joblib.load(os.path.join(self.path, entry['file']), mmap_mode='r')
+
+    def save(self, fingerprint: str, payload: Dict[str, Any],
+             training_time: float, **metadata) -> str:
+        """
+        Persist an artifact and record it in the registry index
+
+        Args:
+            fingerprint: Key from fingerprint_training_run
+            payload: Objects to store; saved uncompressed so they can be
+                memory-mapped on load
+            training_time: Fit wall time in seconds
+            **metadata: Extra JSON-serializable fields for the index
+
+        Returns:
+            Path of the artifact file
+        """
+        filename = f'{fingerprint}.joblib'
+        file_path = os.path.join(self.path, filename)
+        joblib.dump(payload, file_path)
+
+        index = self._read_index()
+        index[fingerprint] = {
+            'file': filename,
+            'size_bytes': os.path.getsize(file_path),
+            'training_time': training_time,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            **metadata
+        }
+        self._write_index(index)
+        return file_path
+
+    def remove(self, fingerprint: str) -> None:
+        """Delete an artifact and its index entry"""
+        index = self._read_index()
+        entry = index.pop(fingerprint, None)
+        if entry is None:
+            return
+        file_path = os.path.join(self.path, entry['file'])
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        self._write_index(index)
+
+    def list_artifacts(self) -> pd.DataFrame:
+        """Registry contents: one row per fingerprint with size and training time"""
+        index = self._read_index()
+        rows: List[Dict[str, Any]] = [
+            {'fingerprint': fingerprint, **entry}
+            for fingerprint, entry in index.items()]
+        return pd.DataFrame(rows)
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, 'r') as f:
+            return json.load(f)
+
+    def _write_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
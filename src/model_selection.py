@@ -0,0 +1,177 @@
+import os
+import time
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Indices = Union[slice, np.ndarray]
+
+
+class PurgedKFold:
+    """K-fold splitter for time series with purging and embargo
+
+    Test folds are contiguous blocks in time. Training rows whose label
+    window (the next label_horizon bars) reaches into the test block are
+    purged, and the embargo bars right after the test block are dropped
+    as well, so no training label overlaps the test period.
+    """
+
+    def __init__(self, n_splits: int = 5, label_horizon: int = 1,
+                 embargo: Optional[int] = None):
+        if n_splits < 2:
+            raise ValueError(f"n_splits must be at least 2, got {n_splits}")
+        self.n_splits = n_splits
+        self.label_horizon = label_horizon
+        self.embargo = label_horizon if embargo is None else embargo
+
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return self.n_splits
+
+    def split(self, X, y=None, groups=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (train, test) index arrays"""
+        n_samples = len(X)
+        indices = np.arange(n_samples)
+        bounds = np.linspace(0, n_samples, self.n_splits + 1).astype(int)
+
+        for test_start, test_stop in zip(bounds[:-1], bounds[1:]):
+            train_before = indices[:max(0, test_start - self.label_horizon)]
+            train_after = indices[min(n_samples, test_stop + self.embargo):]
+            yield (np.concatenate([train_before, train_after]),
+                   indices[test_start:test_stop])
+
+
+def _as_slice(indices: np.ndarray) -> Indices:
+    """Turn a contiguous index array into a slice so fold matrices stay views"""
+    if len(indices) and indices[-1] - indices[0] + 1 == len(indices):
+        return slice(int(indices[0]), int(indices[-1]) + 1)
+    return indices
+
+
+def _fit_and_score(estimator: Any, params: Dict, X: np.ndarray, y: np.ndarray,
+                   train: Indices, test: Indices) -> Tuple[float, float, float]:
+    """Fit one candidate on one fold; returns (score, fit_time, total_time)"""
+    start = time.perf_counter()
+    model = clone(estimator).set_params(**params)
+    model.fit(X[train], y[train])
+    fit_time = time.perf_counter() - start
+    score = model.score(X[test], y[test])
+    return score, fit_time, time.perf_counter() - start
+
+
+def run_folds(estimator: Any,
+              X: pd.DataFrame,
+              y: pd.Series,
+              candidates: List[Dict],
+              cv: Any,
+              n_jobs: int = -1) -> List[List[Tuple[float, float, float]]]:
+    """
+    Evaluate candidate parameter sets on every fold in parallel
+
+    X and y are dumped once to a temporary memory-mapped file, so workers
+    read the same pages instead of each receiving a pickled copy;
+    contiguous folds are passed as slices and stay views of that map.
+
+    Returns:
+        For each candidate, a list of (score, fit_time, total_time) per fold
+    """
+    folds = [(_as_slice(train), _as_slice(test)) for train, test in cv.split(X)]
+    # Parallelism is across (candidate, fold) pairs, not inside the forest
+    params = [{**candidate, 'n_jobs': 1}
+              if 'n_jobs' in estimator.get_params() else candidate
+              for candidate in candidates]
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'folds.joblib')
+        joblib.dump((np.asarray(X, dtype=np.float64), np.asarray(y)), path)
+        X_shared, y_shared = joblib.load(path, mmap_mode='r')
+
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_and_score)(estimator, candidate, X_shared, y_shared,
+                                    train, test)
+            for candidate in params for train, test in folds)
+        del X_shared, y_shared
+
+    n_folds = len(folds)
+    return [results[i * n_folds:(i + 1) * n_folds]
+            for i in range(len(candidates))]
+
+
+def search_hyperparameters(estimator: Any,
+                           X: pd.DataFrame,
+                           y: pd.Series,
+                           param_grid: Dict[str, Iterable],
+                           n_splits: int = 5,
+                           n_jobs: int = -1,
+                           cv: Optional[Any] = None) -> pd.DataFrame:
+    """
+    Grid search over estimator parameters with time-ordered folds
+
+    Args:
+        estimator: Unfitted scikit-learn estimator
+        X: Feature matrix in time order
+        y: Target vector
+        param_grid: Mapping of parameter name to candidate values
+        n_splits: Number of expanding-window folds when cv is not given
+        n_jobs: Worker processes for (candidate, fold) pairs
+        cv: Splitter with a split(X) method; defaults to TimeSeriesSplit
+
+    Returns:
+        One row per candidate sorted by mean score, with per-fold scores,
+        the summed fold fit time and the candidate's total wall time
+    """
+    cv = cv or TimeSeriesSplit(n_splits=n_splits)
+    candidates = list(ParameterGrid(param_grid))
+    results = run_folds(estimator, X, y, candidates, cv, n_jobs)
+
+    rows = []
+    for candidate, folds in zip(candidates, results):
+        scores = np.array([score for score, _, _ in folds])
+        rows.append({
+            'params': candidate,
+            **candidate,
+            'mean_score': scores.mean(),
+            'std_score': scores.std(),
+            'fold_scores': scores.tolist(),
+            'fit_time': sum(fit_time for _, fit_time, _ in folds),
+            'wall_time': sum(total for _, _, total in folds)
+        })
+
+    return pd.DataFrame(rows).sort_values(
+        'mean_score', ascending=False).reset_index(drop=True)
+
+
+def cross_validate(estimator: Any,
+                   X: pd.DataFrame,
+                   y: pd.Series,
+                   cv: Any,
+                   n_jobs: int = -1) -> pd.DataFrame:
+    """
+    Fit and score an estimator on every fold in parallel
+
+    Args:
+        estimator: Unfitted scikit-learn estimator
+        X: Feature matrix in time order (memory-mapped for the workers)
+        y: Target vector
+        cv: Splitter with a split(X) method, e.g. PurgedKFold
+        n_jobs: Worker processes, one fold each
+
+    Returns:
+        One row per fold with train/test sizes, score, fit time and total time
+    """
+    folds = list(cv.split(X))
+    results = run_folds(estimator, X, y, [{}], cv, n_jobs)[0]
+
+    return pd.DataFrame([{
+        'fold': i,
+        'train_size': len(train),
+        'test_size': len(test),
+        'score': score,
+        'fit_time': fit_time,
+        'total_time': total_time
+    } for i, ((train, test), (score, fit_time, total_time))
+        in enumerate(zip(folds, results))])
@@ -1,8 +1,18 @@
+import time
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from typing import Tuple, Dict, Any
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from typing import Tuple, Dict, Any, List, Optional
+
+from src.feature_selection import FeatureSelector
+from src.labeling import TAKE_PROFIT, triple_barrier_labels_from_config
+from src.model_registry import ModelRegistry, fingerprint_training_run
+from src.prediction_cache import PredictionCache, row_keys
+from src.model_selection import PurgedKFold, cross_validate, search_hyperparameters
+from src.tree_export import FlatForest
 
 
 class TradingModel:
@@ -11,6 +21,17 @@ class TradingModel:
     def __init__(self, config: Dict = None):
         self.config = config or {}
         self.model = self._initialize_model()
+        self.fingerprint: Optional[str] = None
+        self.feature_columns: Optional[List[str]] = None
+
+        artifact_dir = self.config.get('model', {}).get('artifact_dir')
+        self.registry = ModelRegistry(artifact_dir) if artifact_dir else None
+
+        cache_config = self.config.get('model', {}).get('prediction_cache', {})
+        self.prediction_cache = PredictionCache(
+            cache_config['path'],
+            cache_config.get('max_models_in_memory', 4)
+        ) if cache_config.get('path') else None
 
     def _initialize_model(self) -> Any:
         """Initialize the machine learning model"""
@@ -20,36 +41,464 @@ class TradingModel:
         if model_type == 'random_forest':
             return RandomForestClassifier(
                 n_estimators=model_config.get('n_estimators', 100),
+                max_depth=model_config.get('max_depth'),
+                n_jobs=model_config.get('n_jobs'),
+                random_state=42
+            )
+        elif model_type == 'hist_gradient_boosting':
+            hgb_config = model_config.get('hist_gradient_boosting', {})
+            return BinnedHistGradientBoosting(
+                max_iter=hgb_config.get('max_iter', 200),
+                learning_rate=hgb_config.get('learning_rate', 0.1),
+                max_leaf_nodes=hgb_config.get('max_leaf_nodes', 31),
+                max_depth=model_config.get('max_depth'),
+                max_bins=hgb_config.get('max_bins', 255),
+                random_state=42
+            )
+        elif model_type == 'online':
+            online_config = model_config.get('online', {})
+            return OnlineClassifier(
+                loss=online_config.get('loss', 'log_loss'),
+                alpha=online_config.get('alpha', 0.0001),
                 random_state=42
             )
         else:
             raise ValueError(f"Unsupported model type: {model_type}")
 
     def prepare_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
-        """Prepare data for training"""
-        # Create target variable (1 if price goes up, 0 if down)
-        df['target'] = (df['close'].shift(-1) > df['close']).astype(int)
+        """
+        Prepare data for training
+
+        Bars whose label would need data past the end of df (the last
+        label_horizon bars) have no known outcome and are dropped, so X can
+        be shorter than df.
+        """
+        target = self.config.get('model', {}).get('target', 'next_close')
+
+        if target == 'triple_barrier':
+            # 1 if the backtest's take-profit would be hit before its stop-loss
+            label = triple_barrier_labels_from_config(df, self.config)['label']
+            y = (label == TAKE_PROFIT).astype(int).where(label.notna())
+        elif target == 'next_close':
+            # Create target variable (1 if price goes up, 0 if down)
+            next_close = df['close'].shift(-1)
+            y = (next_close > df['close']).astype(int).where(next_close.notna())
+        else:
+            raise ValueError(f"Unsupported target: {target}")
 
         # Remove date column and target column for features
         feature_cols = [
             col for col in df.columns if col not in ['date', 'target']]
 
-        return df[feature_cols], df['target']
+        labeled = y.notna()
+        return df.loc[labeled, feature_cols], y[labeled].astype(int).rename('target')
 
     def train(self, X: pd.DataFrame, y: pd.Series) -> None:
-        """Train the model"""
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        """Train the model, or load it from the registry if already trained"""
+        # Time-ordered holdout; training labels that would peek into the
+        # test period are purged
+        split = int(len(X) * 0.8)
+        train_stop = max(0, split - self.label_horizon)
+        X_train, X_test = X.iloc[:train_stop], X.iloc[split:]
+        y_train, y_test = y.iloc[:train_stop], y.iloc[split:]
 
-        self.model.fit(X_train, y_train)
+        self.fingerprint = fingerprint_training_run(
+            X, y, self.model,
+            selection=self.config.get('model', {}).get('feature_selection'))
+        self.feature_columns = list(X.columns)
+
+        if not self._load_artifact():
+            start = time.perf_counter()
+            self.model.fit(X_train, y_train)
+            self._select_features(X_train, y_train)
+            self._save_artifact(time.perf_counter() - start)
 
         # Print model performance
-        train_score = self.model.score(X_train, y_train)
-        test_score = self.model.score(X_test, y_test)
+        train_score = self.model.score(self._select(X_train), y_train)
+        test_score = self.model.score(self._select(X_test), y_test)
         print(f"Train accuracy: {train_score:.4f}")
         print(f"Test accuracy: {test_score:.4f}")
 
-    def predict(self, X: pd.DataFrame) -> np.ndarray:
-        """Make predictions"""
-        return self.model.predict(X)
+    def _select_features(self, X_train: pd.DataFrame, y_train: pd.Series) -> None:
+        """Prune features by importance and refit on the kept ones, if enabled"""
+        selection_config = dict(
+            self.config.get('model', {}).get('feature_selection', {}))
+        if not selection_config.pop('enabled', False):
+            return
+
+        selector = FeatureSelector(**selection_config).fit(
+            self.model, X_train, y_train)
+        self.feature_columns = selector.selected_
+        self.model.fit(X_train[self.feature_columns], y_train)
+
+        print(f"Selected {len(self.feature_columns)} of {X_train.shape[1]} features")
+        for feature, reason in selector.dropped_.items():
+            print(f"  dropped {feature}: {reason}")
+
+    def _select(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Restrict a frame to the columns the model was trained on"""
+        if self.feature_columns is not None and isinstance(X, pd.DataFrame):
+            return X[self.feature_columns]
+        return X
+
+    @property
+    def label_horizon(self) -> int:
+        """Bars of future data each training label looks at"""
+        model_config = self.config.get('model', {})
+        if model_config.get('target', 'next_close') == 'triple_barrier':
+            return self.config.get('labeling', {}).get('max_holding', 20)
+        return 1
+
+    def cross_validate(self, X: pd.DataFrame, y: pd.Series) -> pd.DataFrame:
+        """
+        Purged, embargoed k-fold evaluation with folds fitted in parallel
+
+        Fold count, embargo and worker count come from model.cv in the
+        config; the purge width is the label horizon.
+
+        Returns:
+            Per-fold scores and timings
+        """
+        cv_config = self.config.get('model', {}).get('cv', {})
+        cv = PurgedKFold(
+            n_splits=cv_config.get('n_splits', 5),
+            label_horizon=self.label_horizon,
+            embargo=cv_config.get('embargo')
+        )
+
+        results = cross_validate(self.model, X, y, cv,
+                                 n_jobs=cv_config.get('n_jobs', -1))
+        print(f"CV accuracy: {results['score'].mean():.4f} "
+              f"(+/- {results['score'].std():.4f}) over {len(results)} folds")
+        return results
+
+    def update(self, X: pd.DataFrame, y: pd.Series) -> None:
+        """
+        Incrementally update an online model with a new batch of labeled bars
+
+        Cost is proportional to the batch, not the history. The fingerprint
+        is chained from the previous one so it still identifies the model.
+        Only the features kept by train() are used.
+        """
+        if not hasattr(self.model, 'partial_fit'):
+            raise ValueError(
+                f"{type(self.model).__name__} does not support incremental updates; "
+                "set model.type to 'online'")
+
+        X = self._select(X)
+        self.model.partial_fit(X, y)
+        self.feature_columns = self.feature_columns or list(X.columns)
+        self.fingerprint = fingerprint_training_run(
+            X, y, self.model, parent=self.fingerprint)
+
+    def tune(self, X: pd.DataFrame, y: pd.Series,
+             param_grid: Optional[Dict[str, List]] = None) -> pd.DataFrame:
+        """
+        Search hyperparameters with purged time-ordered folds and adopt the best
+
+        Args:
+            X: Feature matrix in time order
+            y: Target vector
+            param_grid: Candidate values per parameter (defaults to the
+                model.search.param_grid entry for the configured model.type)
+
+        Returns:
+            Search results, best candidate first, with per-candidate timing
+        """
+        model_config = self.config.get('model', {})
+        search_config = model_config.get('search', {})
+        model_type = model_config.get('type', 'random_forest')
+        if param_grid is None:
+            param_grid = search_config.get('param_grid', {}).get(model_type)
+            if not param_grid:
+                raise ValueError(
+                    f"No model.search.param_grid entry for model type {model_type}")
+
+        # Purge training labels that look into each test fold
+        cv = PurgedKFold(
+            n_splits=search_config.get('n_splits', 5),
+            label_horizon=self.label_horizon,
+            embargo=search_config.get('embargo')
+        )
+
+        results = search_hyperparameters(
+            self.model, X, y, param_grid,
+            n_jobs=search_config.get('n_jobs', -1),
+            cv=cv
+        )
+
+        for row in results.itertuples():
+            print(f"{row.params}: score {row.mean_score:.4f} "
+                  f"(+/- {row.std_score:.4f}), wall time {row.wall_time:.2f}s")
+
+        self.model.set_params(**results.loc[0, 'params'])
+        return results
+
+    def predict(self, X: pd.DataFrame,
+                timestamps: Optional[pd.Index] = None) -> np.ndarray:
+        """
+        Make predictions
+
+        When a prediction cache is configured, bars already scored by this
+        model (same fingerprint, timestamp and feature values) are served
+        from the cache and only the remaining rows are sent to the model.
+
+        Args:
+            X: Feature matrix
+            timestamps: Bar timestamps, hashed with the feature values into
+                cache keys; defaults to X's
+                index when it is a DatetimeIndex, otherwise the cache is skipped
+        """
+        if timestamps is None and isinstance(getattr(X, 'index', None), pd.DatetimeIndex):
+            timestamps = X.index
+        if self.prediction_cache is None or self.fingerprint is None \
+                or timestamps is None:
+            return self.model.predict(self._select(X))
+
+        X = self._select(X)
+        keys = row_keys(X, timestamps)
+        found, cached = self.prediction_cache.lookup(self.fingerprint, keys)
+        if found.all():
+            return cached
+
+        missing = ~found
+        X_missing = X[missing] if isinstance(X, pd.DataFrame) else np.asarray(X)[missing]
+        fresh = self.model.predict(X_missing)
+        self.prediction_cache.store(self.fingerprint, keys[missing], fresh)
+
+        predictions = np.empty(len(found), dtype=fresh.dtype)
+        predictions[found] = cached
+        predictions[missing] = fresh
+        return predictions
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Class probabilities, one column per class in model.classes_"""
+        return self.model.predict_proba(self._select(X))
+
+    def compile(self) -> FlatForest:
+        """
+        Flatten the trained forest into an array-based evaluator
+
+        The returned FlatForest predicts single rows or small batches
+        without sklearn's validation overhead and matches model.predict
+        exactly. Columns must be passed in self.feature_columns order.
+        """
+        if not isinstance(self.model, RandomForestClassifier):
+            raise ValueError(
+                f"Cannot compile {type(self.model).__name__}; only random forests")
+        return FlatForest.from_sklearn(self.model)
+
+    def _load_artifact(self) -> bool:
+        """Warm-start from a registry artifact matching the current fingerprint"""
+        if self.registry is None:
+            return False
+
+        artifact = self.registry.load(self.fingerprint)
+        if artifact is None:
+            return False
+
+        self.model = artifact['model']
+        self.feature_columns = artifact['feature_columns']
+        print(f"Loaded model artifact {self.fingerprint[:12]}")
+        return True
+
+    def _save_artifact(self, training_time: float) -> None:
+        """Persist the fitted model under the current fingerprint"""
+        if self.registry is None:
+            return
+
+        self.registry.save(
+            self.fingerprint,
+            {'model': self.model, 'feature_columns': self.feature_columns},
+            training_time=training_time,
+            model_type=type(self.model).__name__,
+            n_features=len(self.feature_columns)
+        )
+
+
+def _make_writable(estimator: Any) -> None:
+    """Replace read-only (e.g. memory-mapped) fitted arrays with writable copies"""
+    for name, value in vars(estimator).items():
+        if isinstance(value, np.ndarray) and not value.flags.writeable:
+            setattr(estimator, name, np.array(value))
+
+
+class OnlineClassifier(BaseEstimator, ClassifierMixin):
+    """Standardized SGD classifier that can be updated one batch at a time
+
+    Both the scaler and the linear model support partial_fit, so an update
+    touches only the new rows. Missing values are imputed with the running
+    feature mean (zero after scaling).
+    """
+
+    def __init__(self, loss: str = 'log_loss', alpha: float = 0.0001,
+                 classes: Tuple[int, ...] = (0, 1), random_state: Optional[int] = None):
+        self.loss = loss
+        self.alpha = alpha
+        self.classes = classes
+        self.random_state = random_state
+
+    def fit(self, X, y) -> 'OnlineClassifier':
+        """Fit from scratch on the full history"""
+        self.scaler_ = StandardScaler().fit(X)
+        self.model_ = self._new_model().fit(self._transform(X), y)
+        self.classes_ = self.model_.classes_
+        return self
+
+    def partial_fit(self, X, y) -> 'OnlineClassifier':
+        """Update the scaler statistics and the model with one batch"""
+        if not hasattr(self, 'model_'):
+            self.scaler_ = StandardScaler()
+            self.model_ = self._new_model()
+        else:
+            # Registry artifacts are loaded memory-mapped read-only, and
+            # SGDClassifier updates its coefficients in place
+            _make_writable(self.scaler_)
+            _make_writable(self.model_)
+
+        self.scaler_.partial_fit(X)
+        self.model_.partial_fit(self._transform(X), y,
+                                classes=np.asarray(self.classes))
+        self.classes_ = self.model_.classes_
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return self.model_.predict(self._transform(X))
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.model_.predict_proba(self._transform(X))
+
+    def _new_model(self) -> SGDClassifier:
+        return SGDClassifier(loss=self.loss, alpha=self.alpha,
+                             random_state=self.random_state)
+
+    def _transform(self, X) -> np.ndarray:
+        return np.nan_to_num(self.scaler_.transform(X), nan=0.0)
+
+
+class FeatureBinner:
+    """Quantile binning of feature columns, reused across retrains
+
+    Bin edges are fitted once and kept while the feature columns stay the
+    same. Binned codes are also cached by row label together with a hash
+    of the row's values, so retraining on a window that overlaps the
+    previous one only bins the new or changed rows. The cache is not
+    pickled.
+    """
+
+    def __init__(self, max_bins: int = 255, subsample: int = 200_000,
+                 random_state: Optional[int] = None):
+        self.max_bins = max_bins
+        self.subsample = subsample
+        self.random_state = random_state
+        self.columns: Optional[List[str]] = None
+        self.edges: List[np.ndarray] = []
+        self._codes: Optional[pd.DataFrame] = None
+        self._row_hashes: Optional[np.ndarray] = None
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['_codes'] = None
+        state['_row_hashes'] = None
+        return state
+
+    def is_fitted_for(self, X: pd.DataFrame) -> bool:
+        return self.columns == list(X.columns)
+
+    def fit(self, X: pd.DataFrame) -> 'FeatureBinner':
+        """Compute bin edges from (a subsample of) X"""
+        values = X.to_numpy(dtype=float)
+        if len(values) > self.subsample:
+            rng = np.random.default_rng(self.random_state)
+            values = values[rng.choice(len(values), self.subsample, replace=False)]
+
+        levels = np.linspace(0, 1, self.max_bins + 1)[1:-1]
+        self.edges = []
+        for column in values.T:
+            column = column[~np.isnan(column)]
+            edges = np.unique(np.quantile(column, levels)) if len(column) else np.array([])
+            self.edges.append(edges)
+
+        self.columns = list(X.columns)
+        self._codes = None
+        self._row_hashes = None
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Bin codes as float32 (NaN kept for missing), reusing cached rows"""
+        hashes = pd.util.hash_pandas_object(X, index=False).to_numpy()
+        reuse = np.zeros(len(X), dtype=bool)
+        if self._codes is not None and X.index.is_unique:
+            # A cached row is only reused if its values are unchanged
+            positions = self._codes.index.get_indexer(X.index)
+            known = positions >= 0
+            reuse[known] = self._row_hashes[positions[known]] == hashes[known]
+
+        new_rows = X.loc[~reuse]
+        codes = pd.DataFrame(
+            self.bin_values(new_rows.to_numpy(dtype=float)),
+            index=new_rows.index, columns=self.columns)
+
+        if reuse.any():
+            codes = pd.concat([self._codes.loc[X.index[reuse]], codes]).loc[X.index]
+
+        if X.index.is_unique:
+            self._codes = codes
+            self._row_hashes = hashes
+        return codes
+
+    def bin_values(self, values: np.ndarray) -> np.ndarray:
+        """Map raw values to bin codes column by column"""
+        codes = np.empty(values.shape, dtype=np.float32)
+        for j, edges in enumerate(self.edges):
+            codes[:, j] = np.searchsorted(edges, values[:, j], side='right')
+        codes[np.isnan(values)] = np.nan
+        return codes
+
+
+class BinnedHistGradientBoosting(BaseEstimator, ClassifierMixin):
+    """Histogram gradient boosting on features pre-binned by a FeatureBinner
+
+    The binner survives refits, so repeated training on overlapping
+    windows reuses bin edges and already-binned rows; the booster then
+    works on at most max_bins distinct values per feature.
+    """
+
+    def __init__(self, max_iter: int = 200, learning_rate: float = 0.1,
+                 max_leaf_nodes: int = 31, max_depth: Optional[int] = None,
+                 max_bins: int = 255, random_state: Optional[int] = None):
+        self.max_iter = max_iter
+        self.learning_rate = learning_rate
+        self.max_leaf_nodes = max_leaf_nodes
+        self.max_depth = max_depth
+        self.max_bins = max_bins
+        self.random_state = random_state
+
+    def fit(self, X, y) -> 'BinnedHistGradientBoosting':
+        X = pd.DataFrame(X)
+        binner = getattr(self, 'binner_', None)
+        if binner is None or binner.max_bins != self.max_bins \
+                or not binner.is_fitted_for(X):
+            binner = FeatureBinner(self.max_bins, random_state=self.random_state).fit(X)
+        self.binner_ = binner
+
+        self.model_ = HistGradientBoostingClassifier(
+            max_iter=self.max_iter,
+            learning_rate=self.learning_rate,
+            max_leaf_nodes=self.max_leaf_nodes,
+            max_depth=self.max_depth,
+            max_bins=self.max_bins,
+            random_state=self.random_state
+        ).fit(self.binner_.transform(X).to_numpy(), y)
+        self.classes_ = self.model_.classes_
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return self.model_.predict(self._transform(X))
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.model_.predict_proba(self._transform(X))
+
+    def _transform(self, X) -> np.ndarray:
+        X = pd.DataFrame(X, columns=self.binner_.columns)
+        return self.binner_.bin_values(X.to_numpy(dtype=float))
@@ -0,0 +1,251 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.shared_arrays import ArraySpec, SharedArrayPool, attach_array
+from src.strategies.strategy_factory import StrategyFactory
+
+# Set in each worker by _attach_data; the handle keeps the buffer mapped
+_worker_block = None
+_worker_data: Optional[pd.DataFrame] = None
+
+
+def _attach_data(values_spec: ArraySpec, index_spec: ArraySpec,
+                 columns: List[str]) -> None:
+    """Worker initializer: wrap the shared price block in a DataFrame once"""
+    global _worker_block, _worker_data
+    _worker_block, values = attach_array(values_spec)
+    index_block, index = attach_array(index_spec)
+    # The index is small, so it is copied and its block released
+    dates = pd.DatetimeIndex(index.copy().view('datetime64[ns]'))
+    del index
+    index_block.close()
+    _worker_data = pd.DataFrame(values, index=dates, columns=columns, copy=False)
+
+
+def _evaluate(strategy_type: str, params: Dict[str, Any],
+              n_bars: int) -> Dict[str, float]:
+    """Worker: backtest one parameter set on the last n_bars of the shared data"""
+    strategy = StrategyFactory.create_strategy(strategy_type, params)
+    strategy.set_data(_worker_data.iloc[-n_bars:])
+    strategy.backtest()
+    return strategy.calculate_metrics()
+
+
+class StrategyOptimizer:
+    """Parallel parameter search for StrategyFactory strategies
+
+    Prices are fetched once and placed in shared memory; every worker in
+    the process pool attaches to the same block when it starts, so
+    candidates are sent as small parameter dicts. Evaluations are yielded
+    as they complete, and a search can stop early once the objective stops
+    improving.
+    """
+
+    def __init__(self,
+                 strategy_type: str,
+                 params: Dict[str, Any],
+                 objective: str = 'Sharpe Ratio',
+                 maximize: bool = True,
+                 data: Optional[pd.DataFrame] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            strategy_type: StrategyFactory strategy type
+            params: Fixed parameters (symbol, start_date, end_date, ...)
+            objective: calculate_metrics key to optimize
+            maximize: Whether larger objective values are better
+            data: Already loaded prices; fetched with the strategy's
+                fetch_data when not given
+            max_workers: Worker processes
+        """
+        self.strategy_type = strategy_type
+        self.objective = objective
+        self.maximize = maximize
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        if data is None:
+            data = StrategyFactory.create_strategy(strategy_type, params).fetch_data()
+        self.data = data.select_dtypes('number')
+        self.params = {
+            'symbol': '',
+            'start_date': str(self.data.index[0].date()),
+            'end_date': str(self.data.index[-1].date()),
+            **params
+        }
+
+    def grid_search(self, param_grid: Dict[str, Iterable],
+                    patience: Optional[int] = None,
+                    callback: Optional[Callable[[Dict], None]] = None) -> pd.DataFrame:
+        """Evaluate every combination of param_grid"""
+        return self._search(list(ParameterGrid(param_grid)), patience, callback)
+
+    def random_search(self, param_distributions: Dict[str, Any], n_iter: int = 50,
+                      random_state: Optional[int] = None,
+                      patience: Optional[int] = None,
+                      callback: Optional[Callable[[Dict], None]] = None) -> pd.DataFrame:
+        """Evaluate n_iter candidates sampled from lists or scipy distributions"""
+        candidates = list(ParameterSampler(param_distributions, n_iter,
+                                           random_state=random_state))
+        return self._search(candidates, patience, callback)
+
+    def successive_halving(self, param_space: Dict[str, Any],
+                           n_candidates: Optional[int] = None,
+                           min_bars: int = 250,
+                           eta: int = 3,
+                           random_state: Optional[int] = None,
+                           callback: Optional[Callable[[Dict], None]] = None) -> pd.DataFrame:
+        """
+        Successive halving with trailing history length as the budget
+
+        All candidates are first scored on the last min_bars bars; only the
+        best 1/eta of each rung advance to the next, which uses eta times
+        as many bars, until the full history is reached.
+
+        Args:
+            param_space: Grid (all combinations) or, with n_candidates,
+                distributions to sample from
+            n_candidates: Number of sampled candidates; None uses the full grid
+            min_bars: Bars in the first rung
+            eta: Reduction factor between rungs
+            random_state: Seed for sampling candidates
+            callback: Called with every result as it arrives
+
+        Returns:
+            Every evaluation with its rung and n_bars, final rung first
+        """
+        if n_candidates is None:
+            candidates = list(ParameterGrid(param_space))
+        else:
+            candidates = list(ParameterSampler(param_space, n_candidates,
+                                               random_state=random_state))
+
+        rows = []
+        n_bars = min(min_bars, len(self.data))
+        rung = 0
+        with self._pool() as executor:
+            while True:
+                results = []
+                for result in self._stream(executor, candidates, n_bars):
+                    result['rung'] = rung
+                    results.append(result)
+                    if callback:
+                        callback(result)
+                rows.extend(results)
+
+                if n_bars >= len(self.data) or len(candidates) <= 1:
+                    break
+                results.sort(key=lambda result: self._score(result), reverse=True)
+                candidates = [result['params']
+                              for result in results[:max(1, len(results) // eta)]]
+                n_bars = min(n_bars * eta, len(self.data))
+                rung += 1
+
+        return self._to_frame(rows, ['rung', 'n_bars'], ascending=[False, False])
+
+    def stream(self, candidates: List[Dict[str, Any]],
+               n_bars: Optional[int] = None) -> Iterator[Dict]:
+        """Yield results for the candidates in completion order"""
+        with self._pool() as executor:
+            yield from self._stream(executor, candidates, n_bars or len(self.data))
+
+    def _search(self, candidates: List[Dict[str, Any]], patience: Optional[int],
+                callback: Optional[Callable[[Dict], None]]) -> pd.DataFrame:
+        """Run candidates, stopping after patience results without improvement"""
+        rows = []
+        best = -np.inf
+        since_best = 0
+        with self._pool() as executor:
+            for result in self._stream(executor, candidates, len(self.data)):
+                rows.append(result)
+                if callback:
+                    callback(result)
+
+                score = self._score(result)
+                if score > best:
+                    best, since_best = score, 0
+                else:
+                    since_best += 1
+                if patience is not None and since_best >= patience:
+                    print(f"Stopping early after {len(rows)} of {len(candidates)} "
+                          f"candidates: no improvement in {patience}")
+                    break
+
+        return self._to_frame(rows)
+
+    def _pool(self) -> '_OptimizerPool':
+        return _OptimizerPool(self.data, self.max_workers)
+
+    def _stream(self, executor: ProcessPoolExecutor,
+                candidates: List[Dict[str, Any]], n_bars: int) -> Iterator[Dict]:
+        """
+        Submit candidates and yield results as they complete
+
+        At most two tasks per worker are in flight, so stopping the
+        iteration early leaves little queued work to cancel.
+        """
+        pending = {}
+        queue = iter(candidates)
+        try:
+            while True:
+                while len(pending) < 2 * self.max_workers:
+                    candidate = next(queue, None)
+                    if candidate is None:
+                        break
+                    future = executor.submit(_evaluate, self.strategy_type,
+                                             {**self.params, **candidate}, n_bars)
+                    pending[future] = candidate
+
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    candidate = pending.pop(future)
+                    yield {'params': candidate, **candidate, 'n_bars': n_bars,
+                           **future.result()}
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _score(self, result: Dict) -> float:
+        """Objective oriented so larger is better; NaN ranks last"""
+        value = result.get(self.objective, np.nan)
+        if value is None or np.isnan(value):
+            return -np.inf
+        return value if self.maximize else -value
+
+    def _to_frame(self, rows: List[Dict], keys: Optional[List[str]] = None,
+                  ascending: Optional[List[bool]] = None) -> pd.DataFrame:
+        if not rows:
+            return pd.DataFrame()
+        results = pd.DataFrame(rows)
+        results['score'] = [self._score(row) for row in rows]
+        return results.sort_values(
+            (keys or []) + ['score'],
+            ascending=(ascending or []) + [False]).reset_index(drop=True)
+
+
+class _OptimizerPool:
+    """Shared price block plus a process pool whose workers attach to it"""
+
+    def __init__(self, data: pd.DataFrame, max_workers: int):
+        self.data = data
+        self.max_workers = max_workers
+
+    def __enter__(self) -> ProcessPoolExecutor:
+        self.shared = SharedArrayPool()
+        values_spec = self.shared.share('prices', self.data.to_numpy(dtype=float))
+        index_spec = self.shared.share(
+            'index', pd.DatetimeIndex(self.data.index).to_numpy(
+                dtype='datetime64[ns]').view(np.int64))
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_attach_data,
+            initargs=(values_spec, index_spec, list(self.data.columns)))
+        return self.executor
+
+    def __exit__(self, *exc) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        self.shared.close()
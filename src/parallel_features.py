@@ -0,0 +1,151 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.feature_engineering import FeatureEngineer
+from src.shared_arrays import ArraySpec, SharedArrayPool, attach_array
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# (compute_start, write_start, stop) row ranges into the shared input block
+Segment = Tuple[int, int, int]
+
+
+def _compute_segments(input_spec: ArraySpec,
+                      output_spec: ArraySpec,
+                      columns: List[str],
+                      feature_names: List[str],
+                      segments: List[Segment],
+                      config: Dict) -> int:
+    """Worker: compute features for row segments and write them in place"""
+    input_block, inputs = attach_array(input_spec)
+    output_block, outputs = attach_array(output_spec)
+    feature_engineer = FeatureEngineer(config)
+
+    try:
+        for compute_start, write_start, stop in segments:
+            df = pd.DataFrame(inputs[compute_start:stop], columns=columns)
+            features = feature_engineer.calculate_technical_indicators(df)
+            skip = write_start - compute_start
+            outputs[write_start:stop] = \
+                features[feature_names].to_numpy(dtype=float)[skip:]
+    finally:
+        del inputs, outputs
+        input_block.close()
+        output_block.close()
+
+    return len(segments)
+
+
+class ParallelFeatureExecutor:
+    """Run FeatureEngineer across a process pool with shared-memory inputs
+
+    OHLCV columns are copied once into a shared memory block; workers attach
+    to it, compute indicators for their rows and write them straight into a
+    shared output block, so neither inputs nor results are pickled.
+    """
+
+    def __init__(self, config: Dict = None, max_workers: Optional[int] = None):
+        self.config = config or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.feature_engineer = FeatureEngineer(self.config)
+
+    def calculate_universe(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Calculate technical indicators for many symbols in parallel
+
+        Args:
+            data: Mapping of symbol to its OHLCV DataFrame
+
+        Returns:
+            Mapping of symbol to the same frame calculate_technical_indicators
+            would return
+        """
+        symbols = list(data)
+        lengths = np.array([len(data[symbol]) for symbol in symbols])
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        bounds = [(int(offsets[i]), int(offsets[i + 1]))
+                  for i in range(len(symbols))]
+
+        # Balance rows, not symbols: several tasks per worker, largest first
+        n_tasks = min(len(symbols), self.max_workers * 4)
+        tasks: List[List[Segment]] = [[] for _ in range(n_tasks)]
+        task_rows = np.zeros(n_tasks)
+        for i in np.argsort(-lengths, kind='stable'):
+            target = int(np.argmin(task_rows))
+            start, stop = bounds[i]
+            tasks[target].append((start, start, stop))
+            task_rows[target] += stop - start
+
+        frames = [data[symbol] for symbol in symbols]
+        features, feature_names = self._run(frames, tasks)
+
+        return {symbol: self._assemble(data[symbol], features[start:stop],
+                                       feature_names)
+                for symbol, (start, stop) in zip(symbols, bounds)}
+
+    def calculate_history(self, df: pd.DataFrame,
+                          n_chunks: Optional[int] = None,
+                          overlap: Optional[int] = None) -> pd.DataFrame:
+        """
+        Calculate technical indicators for one long history in parallel
+
+        The history is split into contiguous chunks; each chunk is computed
+        with `overlap` extra bars of warm-up before it, which are discarded.
+
+        Args:
+            df: OHLCV DataFrame
+            n_chunks: Number of chunks (defaults to the worker count)
+            overlap: Warm-up bars per chunk (defaults to the feature
+                engineer's max_lookback)
+        """
+        n_chunks = n_chunks or self.max_workers
+        overlap = self.feature_engineer.max_lookback if overlap is None else overlap
+
+        edges = np.linspace(0, len(df), n_chunks + 1).astype(int)
+        tasks = [[(max(0, int(start) - overlap), int(start), int(stop))]
+                 for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+        features, feature_names = self._run([df], tasks)
+        return self._assemble(df, features, feature_names)
+
+    def _feature_names(self, columns: List[str]) -> List[str]:
+        """Indicator columns added by the feature engineer"""
+        sample = pd.DataFrame(np.ones((2, len(columns))), columns=columns)
+        features = self.feature_engineer.lazy_technical_indicators(sample)
+        return [col for col in features.columns if col not in columns]
+
+    def _run(self, frames: List[pd.DataFrame],
+             tasks: List[List[Segment]]) -> Tuple[np.ndarray, List[str]]:
+        """Share inputs, fan tasks out to the pool and collect the output block"""
+        columns = [col for col in OHLCV_COLUMNS if col in frames[0].columns]
+        feature_names = self._feature_names(columns)
+        inputs = np.concatenate(
+            [frame[columns].to_numpy(dtype=float) for frame in frames])
+
+        with SharedArrayPool() as pool:
+            input_spec = pool.share('inputs', inputs)
+            pool.create('features', (len(inputs), len(feature_names)))
+            output_spec = pool.specs['features']
+
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(_compute_segments, input_spec,
+                                           output_spec, columns, feature_names,
+                                           segments, self.config)
+                           for segments in tasks if segments]
+                for future in futures:
+                    future.result()
+
+            features = pool.arrays['features'].copy()
+
+        return features, feature_names
+
+    def _assemble(self, df: pd.DataFrame, features: np.ndarray,
+                  feature_names: List[str]) -> pd.DataFrame:
+        """Attach computed indicator columns to the original frame"""
+        base = df.drop(columns=[col for col in feature_names if col in df.columns])
+        return pd.concat(
+            [base, pd.DataFrame(features, index=df.index, columns=feature_names)],
+            axis=1)
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, Optional, Tuple
+
+
+def rolling_ledoit_wolf(returns: np.ndarray,
+                        ends: np.ndarray,
+                        lookback: int,
+                        batch_size: int = 60) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Ledoit-Wolf shrinkage covariances of trailing windows, in batches of dates
+
+    Window sums (sum of x, x x^T, |x|^2, |x|^2 x and |x|^4) are rolled
+    forward between consecutive dates by adding the rows that entered and
+    subtracting the rows that left, so each date costs O(step * n^2)
+    instead of O(lookback * n^2). Centering and the shrinkage intensity are
+    derived from those sums for a whole batch of dates at once; the result
+    equals sklearn.covariance.LedoitWolf fitted on each window.
+
+    Args:
+        returns: (bars x assets) returns without NaNs
+        ends: Increasing exclusive row ends; date k uses rows
+            [ends[k] - lookback, ends[k])
+        lookback: Rows per window
+        batch_size: Dates per yielded batch (memory is batch_size * n^2)
+
+    Yields:
+        (covariances, means, shrinkage) for each batch, shaped
+        (dates x n x n), (dates x n) and (dates,)
+    """
+    returns = np.asarray(returns, dtype=float)
+    n_assets = returns.shape[1]
+
+    def window_sums(rows: np.ndarray) -> list:
+        squares = np.einsum('ij,ij->i', rows, rows)
+        return [rows.sum(axis=0), rows.T @ rows, squares.sum(),
+                squares @ rows, squares @ squares]
+
+    sums = None
+    previous_end = None
+    for batch_start in range(0, len(ends), batch_size):
+        batch_ends = ends[batch_start:batch_start + batch_size]
+        size = len(batch_ends)
+        first = np.empty((size, n_assets))
+        second = np.empty((size, n_assets, n_assets))
+        norms = np.empty(size)
+        weighted = np.empty((size, n_assets))
+        fourth = np.empty(size)
+
+        for i, end in enumerate(batch_ends):
+            if sums is None or end - previous_end >= lookback:
+                sums = window_sums(returns[end - lookback:end])
+            else:
+                entered = window_sums(returns[previous_end:end])
+                left = window_sums(returns[previous_end - lookback:end - lookback])
+                sums = [total + new - old for total, new, old in zip(sums, entered, left)]
+            previous_end = end
+            first[i], second[i], norms[i], weighted[i], fourth[i] = sums
+
+        yield _shrink(first, second, norms, weighted, fourth, lookback)
+
+
+def _shrink(first: np.ndarray, second: np.ndarray, norms: np.ndarray,
+            weighted: np.ndarray, fourth: np.ndarray,
+            n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ledoit-Wolf estimate from raw window sums, batched over dates"""
+    p = first.shape[1]
+    mean = first / n
+    covariance = second / n - mean[:, :, None] * mean[:, None, :]
+
+    # sum over rows of |x - m|^4, expanded in the raw sums
+    m2 = np.einsum('bi,bi->b', mean, mean)
+    centered_fourth = (fourth
+                       - 4 * np.einsum('bi,bi->b', mean, weighted)
+                       + 4 * np.einsum('bi,bij,bj->b', mean, second, mean)
+                       + 2 * m2 * norms
+                       - 4 * m2 * np.einsum('bi,bi->b', mean, first)
+                       + n * m2 ** 2)
+
+    mu = np.einsum('bii->b', covariance) / p
+    frobenius = np.einsum('bij,bij->b', covariance, covariance)
+    beta = (centered_fourth / n - frobenius) / (p * n)
+    delta = (frobenius - p * mu ** 2) / p
+    beta = np.minimum(beta, delta)
+    shrinkage = np.where(beta == 0, 0.0, beta / np.where(delta == 0, 1.0, delta))
+
+    covariance *= (1 - shrinkage)[:, None, None]
+    diagonal = np.einsum('bii->bi', covariance)
+    diagonal += (shrinkage * mu)[:, None]
+    return covariance, mean, shrinkage
+
+
+def mean_variance_weights(covariances: np.ndarray,
+                          expected_returns: Optional[np.ndarray] = None,
+                          risk_aversion: float = 1.0) -> np.ndarray:
+    """
+    Fully invested mean-variance weights for a batch of dates
+
+    Minimizes risk_aversion / 2 * w'Cw - mu'w subject to sum(w) = 1, with
+    one batched solve for both right-hand sides. Without expected returns
+    this is the minimum-variance portfolio. Short positions are allowed.
+
+    Args:
+        covariances: (dates x n x n) covariance matrices
+        expected_returns: Optional (dates x n) expected returns
+        risk_aversion: Trade-off between variance and expected return
+
+    Returns:
+        (dates x n) weights summing to 1 per date
+    """
+    dates, n, _ = covariances.shape
+    ones = np.ones((dates, n))
+    if expected_returns is None:
+        inverse_ones = np.linalg.solve(covariances, ones[:, :, None])[:, :, 0]
+        return inverse_ones / inverse_ones.sum(axis=1, keepdims=True)
+
+    rhs = np.stack([ones, np.asarray(expected_returns, dtype=float)], axis=2)
+    solved = np.linalg.solve(covariances, rhs)
+    inverse_ones, inverse_mu = solved[:, :, 0], solved[:, :, 1]
+
+    # Lagrange multiplier of the budget constraint, per date
+    budget = (inverse_mu.sum(axis=1) - risk_aversion) / inverse_ones.sum(axis=1)
+    return (inverse_mu - budget[:, None] * inverse_ones) / risk_aversion
+
+
+def risk_parity_weights(covariances: np.ndarray,
+                        budgets: Optional[np.ndarray] = None,
+                        max_iter: int = 100,
+                        tol: float = 1e-10) -> np.ndarray:
+    """
+    Long-only risk-budgeting weights for a batch of dates
+
+    Damped Newton iteration on the convex formulation
+    min 1/2 y'Cy - sum(b log y), batched over dates: every iteration is one
+    batched linear solve with the Hessian C + diag(b / y^2), damped by
+    1 / (1 + decrement). Only the objective divided by min(b) is
+    self-concordant, so where that step would leave the region y > 0
+    the date falls back to damping with the rescaled decrement, which keeps
+    y positive without a line search. Convergence is quadratic near the
+    optimum.
+
+    Args:
+        covariances: (dates x n x n) covariance matrices
+        budgets: Risk budget per asset (default equal); normalized to sum 1
+        max_iter: Maximum Newton iterations
+        tol: Stop when every date's Newton decrement is below tol
+
+    Returns:
+        (dates x n) weights summing to 1 per date, with risk contributions
+        proportional to the budgets
+    """
+    dates, n, _ = covariances.shape
+    budgets = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=float)
+    budgets = budgets / budgets.sum()
+    # Newton decrement of the objective divided by min(b), relative to ours
+    scale = 1.0 / np.sqrt(budgets.min())
+
+    # Inverse-volatility start, scaled so y'Cy = sum(b) as at the optimum
+    y = 1.0 / np.sqrt(np.einsum('bii->bi', covariances))
+    y *= np.sqrt(1.0 / np.einsum('bi,bij,bj->b', y, covariances, y))[:, None]
+
+    hessian = covariances.copy()
+    hessian_diagonal = np.einsum('bii->bi', hessian)
+    for _ in range(max_iter):
+        gradient = np.einsum('bij,bj->bi', covariances, y) - budgets / y
+        hessian_diagonal[:] = np.einsum('bii->bi', covariances) + budgets / y ** 2
+        step = np.linalg.solve(hessian, gradient[:, :, None])[:, :, 0]
+
+        decrement = np.sqrt(np.maximum(np.einsum('bi,bi->b', gradient, step), 0))
+        damping = 1 / (1 + decrement)
+        unsafe = (y - damping[:, None] * step <= 0).any(axis=1)
+        damping[unsafe] = 1 / (1 + scale * decrement[unsafe])
+        y -= damping[:, None] * step
+        if decrement.max() < tol:
+            break
+
+    return y / y.sum(axis=1, keepdims=True)
+
+
+class PortfolioConstructor:
+    """Target weights for every rebalance date, solved in batches of dates
+
+    Shrinkage covariances come from rolling_ledoit_wolf and the weights for
+    a whole batch of dates from one batched solve (mean-variance) or one
+    batched Newton iteration (risk parity).
+    """
+
+    METHODS = ('risk_parity', 'min_variance', 'mean_variance')
+
+    def __init__(self, config: Dict = None):
+        portfolio_config = (config or {}).get('portfolio', {})
+        self.method = portfolio_config.get('method', 'risk_parity')
+        self.lookback = portfolio_config.get('lookback', 252)
+        self.rebalance = portfolio_config.get('rebalance', 'ME')
+        self.risk_aversion = portfolio_config.get('risk_aversion', 1.0)
+        self.batch_size = portfolio_config.get('batch_size', 60)
+        if self.method not in self.METHODS:
+            raise ValueError(f"Unsupported portfolio method: {self.method}")
+
+    def rebalance_weights(self, returns: pd.DataFrame,
+                          rebalance_dates: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        Solve target weights at each rebalance date
+
+        Args:
+            returns: Asset returns with a DatetimeIndex, one column per asset;
+                NaNs count as zero return
+            rebalance_dates: Dates to rebalance at; defaults to the last bar
+                of every period of the configured frequency (monthly)
+
+        Returns:
+            DataFrame of weights indexed by rebalance date. Each date uses the
+            lookback bars up to and including it; dates without a full
+            lookback are skipped.
+        """
+        returns = returns.sort_index()
+        if rebalance_dates is None:
+            rebalance_dates = returns.index.to_series().resample(
+                self.rebalance).last().dropna()
+
+        ends = returns.index.searchsorted(pd.Index(rebalance_dates), side='right')
+        keep = ends >= self.lookback
+        ends = ends[keep]
+        dates = pd.Index(rebalance_dates)[keep]
+
+        values = np.nan_to_num(returns.to_numpy(dtype=float))
+        weights = []
+        for covariances, means, _ in rolling_ledoit_wolf(
+                values, ends, self.lookback, self.batch_size):
+            if self.method == 'risk_parity':
+                weights.append(risk_parity_weights(covariances))
+            elif self.method == 'min_variance':
+                weights.append(mean_variance_weights(covariances))
+            else:
+                weights.append(mean_variance_weights(
+                    covariances, means, self.risk_aversion))
+
+        if not weights:
+            return pd.DataFrame(columns=returns.columns, dtype=float)
+        return pd.DataFrame(np.concatenate(weights), index=dates,
+                            columns=returns.columns)
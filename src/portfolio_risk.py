@@ -0,0 +1,113 @@
+import numpy as np
+from statistics import NormalDist
+from typing import Dict, List, Union
+
+Vector = Union[np.ndarray, List[float], Dict[str, float]]
+
+
+class PortfolioRiskEngine:
+    """Exponentially weighted covariance of symbol returns with incremental updates
+
+    Each bar applies a rank-1 update to the covariance matrix, so an
+    update and every risk query cost O(k^2) for k symbols instead of
+    recomputing from the return history.
+    """
+
+    def __init__(self, symbols: List[str], decay: float = 0.94,
+                 demean: bool = False, periods_per_year: int = 252):
+        """
+        Args:
+            symbols: Symbols in matrix order
+            decay: Weight on the previous estimate per bar (RiskMetrics
+                uses 0.94 for daily returns)
+            demean: Track an exponentially weighted mean as well; by default
+                returns are assumed to have zero mean
+            periods_per_year: Bars per year, for annualized volatility
+        """
+        self.symbols = list(symbols)
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.decay = decay
+        self.demean = demean
+        self.periods_per_year = periods_per_year
+
+        k = len(self.symbols)
+        self.mean = np.zeros(k)
+        self.covariance = np.zeros((k, k))
+        self.n_updates = 0
+
+    def update(self, returns: Vector) -> None:
+        """
+        Fold one bar of returns into the covariance estimate
+
+        Args:
+            returns: Returns aligned with symbols, or a symbol -> return
+                mapping; missing symbols and NaNs count as zero return
+        """
+        r = np.nan_to_num(self._vector(returns))
+        alpha = 1 - self.decay
+
+        if self.demean:
+            deviation = r - self.mean
+            self.mean += alpha * deviation
+            # West's incremental form: C <- decay * (C + alpha * d d^T)
+            self.covariance += alpha * np.outer(deviation, deviation)
+            self.covariance *= self.decay
+        else:
+            self.covariance *= self.decay
+            self.covariance += alpha * np.outer(r, r)
+
+        self.n_updates += 1
+
+    def portfolio_volatility(self, weights: Vector, annualize: bool = False) -> float:
+        """Portfolio return volatility per bar (or annualized)"""
+        w = self._vector(weights)
+        volatility = float(np.sqrt(max(w @ self.covariance @ w, 0.0)))
+        if annualize:
+            volatility *= np.sqrt(self.periods_per_year)
+        return volatility
+
+    def marginal_risk(self, weights: Vector) -> np.ndarray:
+        """Derivative of portfolio volatility with respect to each weight"""
+        w = self._vector(weights)
+        sigma_w = self.covariance @ w
+        volatility = np.sqrt(max(w @ sigma_w, 0.0))
+        if volatility == 0:
+            return np.zeros_like(w)
+        return sigma_w / volatility
+
+    def risk_contributions(self, weights: Vector) -> Dict[str, float]:
+        """Each symbol's share of portfolio volatility (sums to the volatility)"""
+        w = self._vector(weights)
+        contributions = w * self.marginal_risk(w)
+        return dict(zip(self.symbols, contributions.tolist()))
+
+    def parametric_var(self, weights: Vector, portfolio_value: float = 1.0,
+                       confidence: float = 0.99, horizon: int = 1) -> float:
+        """
+        Gaussian value at risk of the portfolio
+
+        Args:
+            weights: Portfolio weights (fractions of portfolio_value)
+            portfolio_value: Value the weights apply to
+            confidence: VaR confidence level
+            horizon: Holding period in bars (square-root-of-time scaling)
+
+        Returns:
+            Loss not exceeded with the given confidence, as a positive amount
+        """
+        z = NormalDist().inv_cdf(confidence)
+        return z * self.portfolio_volatility(weights) * np.sqrt(horizon) * portfolio_value
+
+    def _vector(self, values: Vector) -> np.ndarray:
+        """Align a list/array or a symbol mapping with the matrix order"""
+        if isinstance(values, dict):
+            vector = np.zeros(len(self.symbols))
+            for symbol, value in values.items():
+                vector[self._positions[symbol]] = value
+            return vector
+
+        vector = np.asarray(values, dtype=float)
+        if vector.shape != (len(self.symbols),):
+            raise ValueError(
+                f"Expected {len(self.symbols)} values, got shape {vector.shape}")
+        return vector
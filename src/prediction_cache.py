@@ -0,0 +1,104 @@
+import os
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Tuple
+
+# Sorted row keys and their predictions
+CacheEntry = Tuple[np.ndarray, np.ndarray]
+
+
+def row_keys(X: pd.DataFrame, timestamps: pd.Index) -> np.ndarray:
+    """
+    Cache keys combining each row's timestamp with its feature values
+
+    Rows of different symbols at the same timestamp, or a bar whose
+    features were revised, get different keys, so they are never served
+    each other's predictions.
+
+    Args:
+        X: Feature matrix as passed to the model
+        timestamps: Bar timestamp of each row
+
+    Returns:
+        uint64 key per row
+    """
+    frame = pd.DataFrame(np.asarray(X) if not isinstance(X, pd.DataFrame) else X)
+    frame.index = pd.Index(timestamps)
+    return pd.util.hash_pandas_object(frame, index=True).to_numpy()
+
+
+class PredictionCache:
+    """Model predictions indexed by (model fingerprint, row key)
+
+    Row keys come from row_keys, a hash of each bar's timestamp and feature
+    values. Each fingerprint is stored on disk as two columns, keys.npy and
+    predictions.npy, sorted by key. The most recently used fingerprints are
+    also kept in memory, up to max_models_in_memory.
+    """
+
+    def __init__(self, path: str = 'cache/predictions', max_models_in_memory: int = 4):
+        self.path = path
+        self.max_models_in_memory = max_models_in_memory
+        self._memory: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        os.makedirs(self.path, exist_ok=True)
+
+    def lookup(self, fingerprint: str, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find cached predictions for the given row keys
+
+        Returns:
+            Boolean mask of keys that were found, and the cached
+            predictions for those keys (in the order of the mask)
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        cached_keys, cached_values = self._load(fingerprint)
+        if len(cached_keys) == 0:
+            return np.zeros(len(keys), dtype=bool), cached_values[:0]
+
+        positions = np.searchsorted(cached_keys, keys)
+        positions = np.minimum(positions, len(cached_keys) - 1)
+        found = cached_keys[positions] == keys
+        return found, cached_values[positions[found]]
+
+    def store(self, fingerprint: str, keys: np.ndarray,
+              predictions: np.ndarray) -> None:
+        """Merge new predictions into the fingerprint's columns"""
+        if len(keys) == 0:
+            return
+
+        cached_keys, cached_values = self._load(fingerprint)
+        keys = np.concatenate([cached_keys, np.asarray(keys, dtype=np.uint64)])
+        values = np.concatenate([cached_values.astype(predictions.dtype, copy=False),
+                                 np.asarray(predictions)])
+
+        # Newer predictions win for duplicate keys
+        order = np.argsort(keys, kind='stable')[::-1]
+        keys, first = np.unique(keys[order], return_index=True)
+        values = values[order][first]
+
+        directory = os.path.join(self.path, fingerprint)
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'keys.npy'), keys)
+        np.save(os.path.join(directory, 'predictions.npy'), values)
+        self._remember(fingerprint, (keys, values))
+
+    def _load(self, fingerprint: str) -> CacheEntry:
+        if fingerprint in self._memory:
+            self._memory.move_to_end(fingerprint)
+            return self._memory[fingerprint]
+
+        directory = os.path.join(self.path, fingerprint)
+        if not os.path.exists(os.path.join(directory, 'keys.npy')):
+            return np.array([], dtype=np.uint64), np.array([])
+
+        entry = (np.load(os.path.join(directory, 'keys.npy')),
+                 np.load(os.path.join(directory, 'predictions.npy')))
+        self._remember(fingerprint, entry)
+        return entry
+
+    def _remember(self, fingerprint: str, entry: CacheEntry) -> None:
+        self._memory[fingerprint] = entry
+        self._memory.move_to_end(fingerprint)
+        while len(self._memory) > self.max_models_in_memory:
+            self._memory.popitem(last=False)
@@ -1,10 +1,80 @@
 import numpy as np
-from typing import Dict, Optional
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from src.portfolio_risk import PortfolioRiskEngine, Vector
+from src.risk_simulation import historical_scenarios, parametric_scenarios, simulate_var
+
+
+class ExposureTracker:
+    """Running equity, drawdown and exposure, updated in O(1) per event
+
+    Aggregates are adjusted by the change in the affected symbol's
+    exposure instead of being recomputed over all positions or the
+    equity history.
+    """
+
+    def __init__(self, initial_cash: float):
+        self.cash = initial_cash
+        self.quantities: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.net_exposure = 0.0
+        self.gross_exposure = 0.0
+        self.open_positions = 0
+        self.peak_equity = initial_cash
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+
+    @property
+    def equity(self) -> float:
+        return self.cash + self.net_exposure
+
+    def symbol_exposure(self, symbol: str) -> float:
+        """Signed market value of one symbol's position"""
+        return self.quantities.get(symbol, 0.0) * self.prices.get(symbol, 0.0)
+
+    def on_fill(self, symbol: str, quantity: float, price: float,
+                fees: float = 0.0) -> None:
+        """
+        Record a fill
+
+        Args:
+            symbol: Traded symbol
+            quantity: Signed units (positive buys, negative sells)
+            price: Fill price, also used to mark the position
+            fees: Commissions and other costs paid in cash
+        """
+        self.cash -= quantity * price + fees
+        old_quantity = self.quantities.get(symbol, 0.0)
+        self._revalue(symbol, old_quantity + quantity, price)
+
+    def mark_to_market(self, symbol: str, price: float) -> None:
+        """Revalue a symbol's position at a new price"""
+        self._revalue(symbol, self.quantities.get(symbol, 0.0), price)
+
+    def _revalue(self, symbol: str, quantity: float, price: float) -> None:
+        old_quantity = self.quantities.get(symbol, 0.0)
+        old_exposure = self.symbol_exposure(symbol)
+        new_exposure = quantity * price
+
+        self.net_exposure += new_exposure - old_exposure
+        self.gross_exposure += abs(new_exposure) - abs(old_exposure)
+        self.open_positions += int(quantity != 0) - int(old_quantity != 0)
+        self.quantities[symbol] = quantity
+        self.prices[symbol] = price
+
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        self.current_drawdown = (self.peak_equity - equity) / self.peak_equity
+        self.max_drawdown = max(self.max_drawdown, self.current_drawdown)
 
 
 class RiskManager:
     """Risk management module for position sizing and risk control"""
 
+    MIN_SIGNAL_STRENGTH = 0.55  # Minimum confidence threshold
+
     def __init__(self, config: Dict):
         self.config = config
         self.max_position_size = config.get(
@@ -12,6 +82,13 @@ class RiskManager:
         self.max_drawdown = config.get('risk', {}).get('max_drawdown', 0.2)
         self.portfolio_value = config.get(
             'risk', {}).get('initial_capital', 100000)
+        self.max_portfolio_volatility = config.get(
+            'risk', {}).get('max_portfolio_volatility')
+        self.max_portfolio_var = config.get('risk', {}).get('max_portfolio_var')
+        self.var_confidence = config.get('risk', {}).get('var_confidence', 0.99)
+        self.max_gross_exposure = config.get('risk', {}).get('max_gross_exposure')
+        self.portfolio_risk: Optional[PortfolioRiskEngine] = None
+        self.tracker = ExposureTracker(self.portfolio_value)
 
     def calculate_position_size(self,
                                 signal_strength: float,
@@ -28,7 +105,7 @@ class RiskManager:
         Returns:
             Number of units to trade, or None if no trade recommended
         """
-        if signal_strength < 0.55:  # Minimum confidence threshold
+        if signal_strength < self.MIN_SIGNAL_STRENGTH:
             return None
 
         # Kelly position sizing
@@ -43,6 +120,37 @@ class RiskManager:
 
         return units
 
+    def calculate_position_sizes(self,
+                                 signal_strength: np.ndarray,
+                                 volatility: np.ndarray,
+                                 current_price: np.ndarray,
+                                 rejected: float = 0.0) -> np.ndarray:
+        """
+        Vectorized calculate_position_size over arrays of bars
+
+        Applies the same confidence threshold, Kelly sizing and position
+        limit to every element at once.
+
+        Args:
+            signal_strength: Model prediction probabilities (0 to 1)
+            volatility: Historical volatility per bar (scalar or array)
+            current_price: Asset price per bar (scalar or array)
+            rejected: Units reported where no trade is recommended
+                (e.g. 0.0 or np.nan)
+
+        Returns:
+            Array of units to trade
+        """
+        signal_strength = np.asarray(signal_strength, dtype=float)
+
+        units = self._kelly_criterion_array(signal_strength, volatility)
+        np.minimum(units, self.max_position_size, out=units)
+        units *= self.portfolio_value
+        units /= current_price
+
+        units[signal_strength < self.MIN_SIGNAL_STRENGTH] = rejected
+        return units
+
     def _kelly_criterion(self, win_prob: float, volatility: float) -> float:
         """
         Calculate Kelly Criterion fraction
@@ -60,21 +168,135 @@ class RiskManager:
         kelly = (win_prob * win_loss_ratio - loss_prob) / win_loss_ratio
         return max(0, kelly)  # Never take negative positions
 
+    def _kelly_criterion_array(self, win_prob: np.ndarray,
+                               volatility: np.ndarray) -> np.ndarray:
+        """Vectorized _kelly_criterion; returns a new float array"""
+        win_loss_ratio = 1 + np.asarray(volatility, dtype=float)
+
+        kelly = win_prob * win_loss_ratio
+        kelly -= 1 - win_prob
+        kelly /= win_loss_ratio
+        # Like max(0, kelly): fmax also maps NaN to 0
+        return np.fmax(kelly, 0.0, out=kelly)
+
     def check_risk_limits(self,
-                          current_drawdown: float,
-                          open_positions: int) -> bool:
+                          current_drawdown: Optional[float] = None,
+                          open_positions: Optional[int] = None,
+                          weights: Optional[Vector] = None) -> bool:
         """
         Check if new trades are allowed given current risk exposure
 
+        Args:
+            current_drawdown: Current drawdown from peak equity (defaults to
+                the tracker's)
+            open_positions: Number of open positions (defaults to the
+                tracker's)
+            weights: Proposed portfolio weights per symbol; checked against
+                the portfolio volatility and VaR limits when a risk engine
+                is attached
+
         Returns:
             bool: True if new trades are allowed, False otherwise
         """
+        if current_drawdown is None:
+            current_drawdown = self.tracker.current_drawdown
+        if open_positions is None:
+            open_positions = self.tracker.open_positions
+
         if current_drawdown > self.max_drawdown:
             return False
 
+        if self.max_gross_exposure is not None and self.tracker.equity > 0 and \
+                self.tracker.gross_exposure / self.tracker.equity > self.max_gross_exposure:
+            return False
+
+        if weights is not None and self.portfolio_risk is not None:
+            if self.max_portfolio_volatility is not None and \
+                    self.portfolio_risk.portfolio_volatility(
+                        weights, annualize=True) > self.max_portfolio_volatility:
+                return False
+
+            if self.max_portfolio_var is not None and \
+                    self.portfolio_risk.parametric_var(
+                        weights, confidence=self.var_confidence) > self.max_portfolio_var:
+                return False
+
         # Add other risk checks as needed
         return True
 
+    def attach_portfolio_risk(self, symbols,
+                              decay: Optional[float] = None) -> PortfolioRiskEngine:
+        """
+        Create the covariance engine used by check_risk_limits
+
+        Args:
+            symbols: Symbols tracked by the engine
+            decay: EWMA decay; defaults to risk.covariance_decay (0.94)
+        """
+        if decay is None:
+            decay = self.config.get('risk', {}).get('covariance_decay', 0.94)
+        self.portfolio_risk = PortfolioRiskEngine(symbols, decay=decay)
+        return self.portfolio_risk
+
+    def simulate_var(self,
+                     method: str = 'historical',
+                     returns: Optional[pd.DataFrame] = None,
+                     n_scenarios: Optional[int] = None,
+                     horizon: int = 1,
+                     confidence: Optional[float] = None,
+                     chunk_size: int = 100_000,
+                     seed: Optional[int] = None) -> Tuple[float, float]:
+        """
+        Monte Carlo VaR and expected shortfall of the tracked book
+
+        Args:
+            method: 'historical' (bootstrap from returns) or 'parametric'
+                (Gaussian with the attached risk engine's covariance)
+            returns: Historical returns with one column per symbol; required
+                for the historical method
+            n_scenarios: Scenarios to simulate (risk.simulation_scenarios)
+            horizon: Holding period in bars
+            confidence: Defaults to risk.var_confidence
+            chunk_size: Scenarios generated and evaluated at once
+            seed: Random seed
+
+        Returns:
+            (VaR, CVaR) in currency, as positive losses
+        """
+        n_scenarios = n_scenarios or self.config.get(
+            'risk', {}).get('simulation_scenarios', 1_000_000)
+        confidence = confidence or self.var_confidence
+
+        if method == 'historical':
+            if returns is None:
+                raise ValueError("Historical simulation needs a returns frame")
+            symbols = list(returns.columns)
+            scenarios = historical_scenarios(
+                returns.to_numpy(dtype=float), n_scenarios, horizon, chunk_size, seed)
+        elif method == 'parametric':
+            if self.portfolio_risk is None:
+                raise ValueError("Parametric simulation needs attach_portfolio_risk()")
+            symbols = self.portfolio_risk.symbols
+            scenarios = parametric_scenarios(
+                self.portfolio_risk.mean, self.portfolio_risk.covariance,
+                n_scenarios, horizon, chunk_size, seed)
+        else:
+            raise ValueError(f"Unsupported simulation method: {method}")
+
+        positions = np.array([self.tracker.symbol_exposure(s) for s in symbols])
+        return simulate_var(positions, scenarios, n_scenarios, confidence)
+
+    def on_fill(self, symbol: str, quantity: float, price: float,
+                fees: float = 0.0) -> None:
+        """Record a fill in the tracker and resync sizing to current equity"""
+        self.tracker.on_fill(symbol, quantity, price, fees)
+        self.portfolio_value = self.tracker.equity
+
+    def mark_to_market(self, symbol: str, price: float) -> None:
+        """Revalue a position in the tracker and resync sizing to current equity"""
+        self.tracker.mark_to_market(symbol, price)
+        self.portfolio_value = self.tracker.equity
+
     def update_portfolio_value(self, new_value: float) -> None:
         """Update portfolio value for position sizing calculations"""
         self.portfolio_value = new_value
@@ -0,0 +1,106 @@
+import numpy as np
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+def historical_scenarios(returns: np.ndarray,
+                         n_scenarios: int,
+                         horizon: int = 1,
+                         chunk_size: int = 100_000,
+                         seed: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    Bootstrap scenario returns from historical bars, one chunk at a time
+
+    Each scenario draws horizon bars (whole cross-sections, so correlations
+    are preserved) with replacement and sums their returns.
+
+    Args:
+        returns: (bars x symbols) historical returns; rows with NaNs are dropped
+        n_scenarios: Total scenarios to generate
+        horizon: Bars per scenario
+        chunk_size: Scenarios per yielded (chunk x symbols) matrix
+        seed: Random seed
+    """
+    returns = np.asarray(returns, dtype=float)
+    returns = returns[~np.isnan(returns).any(axis=1)]
+    if len(returns) == 0:
+        raise ValueError("No complete rows of historical returns to sample")
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_scenarios, chunk_size):
+        size = min(chunk_size, n_scenarios - start)
+        scenarios = returns[rng.integers(len(returns), size=size)]
+        for _ in range(horizon - 1):
+            scenarios += returns[rng.integers(len(returns), size=size)]
+        yield scenarios
+
+
+def parametric_scenarios(mean: np.ndarray,
+                         covariance: np.ndarray,
+                         n_scenarios: int,
+                         horizon: int = 1,
+                         chunk_size: int = 100_000,
+                         seed: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    Gaussian scenario returns, one chunk at a time
+
+    The covariance is factored once; each chunk is a single product of
+    standard normal draws with that factor.
+
+    Args:
+        mean: Per-bar mean return of each symbol
+        covariance: Per-bar covariance matrix (positive semi-definite)
+        n_scenarios: Total scenarios to generate
+        horizon: Bars per scenario (mean and covariance scale linearly)
+        chunk_size: Scenarios per yielded (chunk x symbols) matrix
+        seed: Random seed
+    """
+    mean = np.asarray(mean, dtype=float) * horizon
+    covariance = np.asarray(covariance, dtype=float) * horizon
+
+    # eigh instead of Cholesky so singular (e.g. freshly seeded) matrices work
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    factor = (eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))).T
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_scenarios, chunk_size):
+        size = min(chunk_size, n_scenarios - start)
+        scenarios = rng.standard_normal((size, len(mean))) @ factor
+        scenarios += mean
+        yield scenarios
+
+
+def simulate_var(positions: np.ndarray,
+                 scenarios: Iterable[np.ndarray],
+                 n_scenarios: int,
+                 confidence: float = 0.99) -> Tuple[float, float]:
+    """
+    Value at risk and expected shortfall of a book over scenario chunks
+
+    Each chunk's P&L is one matrix-vector product. Only the worst k losses
+    seen so far are kept (k is the tail size at the given confidence), and
+    they are merged with every chunk by partial selection, so memory is
+    bounded by chunk_size + k instead of n_scenarios.
+
+    Args:
+        positions: Signed market value per symbol
+        scenarios: Iterable of (chunk x symbols) scenario returns
+        n_scenarios: Total scenarios across all chunks
+        confidence: VaR confidence level
+
+    Returns:
+        (VaR, CVaR) as positive loss amounts
+    """
+    positions = np.asarray(positions, dtype=float)
+    # Rounded first so 1 - 0.99 float error does not add a scenario
+    k = max(1, int(np.ceil(round(n_scenarios * (1 - confidence), 6))))
+    worst = np.empty(0)
+
+    for chunk in scenarios:
+        losses = -(chunk @ positions)
+        worst = np.concatenate([worst, losses])
+        if len(worst) > k:
+            worst = np.partition(worst, len(worst) - k)[-k:]
+
+    if len(worst) == 0:
+        raise ValueError("No scenarios were generated")
+    return float(worst.min()), float(worst.mean())
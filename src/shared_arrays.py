@@ -0,0 +1,70 @@
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+# (shared memory block name, shape, dtype string) - small and cheap to pickle
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArrayPool:
+    """Owner of NumPy arrays placed in shared memory for worker processes
+
+    Workers receive only an ArraySpec and attach to the same buffer with
+    attach_array, so large inputs are never pickled. The pool must be closed
+    (or used as a context manager) to release the blocks.
+    """
+
+    def __init__(self):
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.specs: Dict[str, ArraySpec] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    def create(self, key: str, shape: Tuple[int, ...], dtype=np.float64,
+               data: Optional[np.ndarray] = None) -> np.ndarray:
+        """Allocate a shared array, optionally filled with data"""
+        dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = shared_memory.SharedMemory(create=True, size=nbytes)
+
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        if data is not None:
+            array[...] = data
+
+        self._blocks[key] = block
+        self.specs[key] = (block.name, tuple(shape), dtype.str)
+        self.arrays[key] = array
+        return array
+
+    def share(self, key: str, data: np.ndarray) -> ArraySpec:
+        """Copy an existing array into shared memory and return its spec"""
+        data = np.ascontiguousarray(data)
+        self.create(key, data.shape, data.dtype, data)
+        return self.specs[key]
+
+    def close(self) -> None:
+        """Release every block owned by the pool"""
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+        self.specs.clear()
+
+    def __enter__(self) -> 'SharedArrayPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_array(spec: ArraySpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Attach to a shared array from a worker process
+
+    Returns:
+        The shared memory handle (close it when done, after dropping
+        references to the array) and the array view on its buffer
+    """
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
@@ -34,6 +34,31 @@ class BaseStrategy(ABC):
         self.portfolio = portfolio
         return portfolio
 
+    def batch_strategy_returns(self, positions: np.ndarray,
+                               trade_cost: float = 0.0) -> np.ndarray:
+        """
+        Strategy_Returns of backtest() for each row of a position matrix
+
+        Replicates the backtest arithmetic on (runs x bars) positions,
+        including holdings pct_change (inf when a position opens, NaN for
+        0 * inf) and an optional cost per unit of position change.
+        """
+        positions = np.asarray(positions, dtype=float)
+        holdings = positions * self.data['Close'].to_numpy(dtype=float)[None, :]
+
+        returns = np.zeros_like(holdings)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[:, 1:] = holdings[:, 1:] / holdings[:, :-1] - 1
+            returns[np.isnan(returns)] = 0
+
+            previous = np.zeros_like(positions)
+            previous[:, 1:] = positions[:, :-1]
+            strategy_returns = previous * returns
+
+        if trade_cost:
+            strategy_returns[:, 1:] -= np.abs(np.diff(positions, axis=1)) * trade_cost
+        return strategy_returns
+
     def calculate_metrics(self) -> dict:
         """Calculate performance metrics"""
         try:
@@ -80,10 +105,16 @@ class BaseStrategy(ABC):
         if self.data.empty:
             raise ValueError("No data fetched. Please check symbol and dates.")
 
+        self.set_data(self.data)
+        print(f"Fetched {len(self.data)} days of data")
+        return self.data
+
+    def set_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Use already loaded price data (e.g. a cached slice) instead of fetching"""
+        self.data = data.copy()
+
         # Calculate basic features without method='ffill'
         self.data['Returns'] = self.data['Close'].pct_change().fillna(0)
         self.data['Volume_Change'] = self.data['Volume'].pct_change().fillna(0)
         self.data['Cash_Flow'] = self.data['Close'] * self.data['Volume']
-
-        print(f"Fetched {len(self.data)} days of data")
         return self.data
@@ -1,10 +1,15 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
+from itertools import product
+from typing import Sequence, Tuple
 from .base_strategy import BaseStrategy
 
 
 class HamiltonianStrategy(BaseStrategy):
+    TRADE_COST = 0.001  # Transaction cost per unit of position change
+
+    SWEEP_PARAMETERS = ['damping', 'friction', 'external_influence', 'price_threshold']
+
     def __init__(self, symbol: str, start_date: str, end_date: str,
                  damping=0.1, external_influence=0.5, friction=0.05,
                  price_threshold=0.02, allocation_threshold=50):
@@ -18,22 +23,6 @@ class HamiltonianStrategy(BaseStrategy):
             'allocation_threshold': allocation_threshold
         }
 
-    def fetch_data(self):
-        """Fetch historical data from Yahoo Finance"""
-        print(f"Fetching data for {self.symbol}...")
-        self.data = yf.download(
-            self.symbol, start=self.start_date, end=self.end_date)
-        if self.data.empty:
-            raise ValueError("No data fetched. Please check symbol and dates.")
-
-        # Calculate basic features without method='ffill'
-        self.data['Returns'] = self.data['Close'].pct_change().fillna(0)
-        self.data['Volume_Change'] = self.data['Volume'].pct_change().fillna(0)
-        self.data['Cash_Flow'] = self.data['Close'] * self.data['Volume']
-
-        print(f"Fetched {len(self.data)} days of data")
-        return self.data
-
     def calculate_potential_energy(self, price, volume):
         """Calculate potential energy based on price and volume"""
         return price * volume
@@ -42,8 +31,16 @@ class HamiltonianStrategy(BaseStrategy):
         """Calculate kinetic energy based on cash flow"""
         return 0.5 * (cash_flow ** 2)
 
-    def generate_signals(self) -> pd.DataFrame:
-        """Generate trading signals based on Hamiltonian mechanics"""
+    def _energy_components(self):
+        """Parameter-free inputs of the Hamiltonian, computed once per data set
+
+        total_energy is linear in damping, friction and external_influence
+        over these components, and the threshold is linear in price_threshold,
+        so parameter sweeps can share them.
+
+        Returns:
+            price_diff, momentum, trend and mean volatility as float Series
+        """
         if self.data is None:
             raise ValueError("No data available. Call fetch_data() first.")
 
@@ -53,28 +50,36 @@ class HamiltonianStrategy(BaseStrategy):
         self.data['Momentum'] = self.data['Returns'].rolling(window=10).sum()
         self.data['Volatility'] = self.data['Returns'].rolling(window=20).std()
 
-        # Calculate Hamiltonian components
         # Calculate price difference as Series
         price_diff = (self.data['Close'] - self.data['SMA20']).astype(float)
-        potential_energy = price_diff * (1 - self.params['damping'])
-
-        # Calculate momentum energy
-        kinetic_energy = self.data['Momentum'].astype(
-            float) * (1 - self.params['friction'])
+        momentum = self.data['Momentum'].astype(float)
 
         # Calculate trend
         trend = pd.Series(
             np.where(self.data['SMA20'] > self.data['SMA50'], 1, -1),
             index=self.data.index
         ).astype(float)
+
+        volatility_mean = self.data['Volatility'].rolling(window=20).mean()
+        return price_diff, momentum, trend, volatility_mean
+
+    def generate_signals(self) -> pd.DataFrame:
+        """Generate trading signals based on Hamiltonian mechanics"""
+        price_diff, momentum, trend, volatility_mean = self._energy_components()
+
+        # Calculate Hamiltonian components
+        potential_energy = price_diff * (1 - self.params['damping'])
+
+        # Calculate momentum energy
+        kinetic_energy = momentum * (1 - self.params['friction'])
+
         external_force = trend * self.params['external_influence']
 
         # Total energy (Hamiltonian)
         total_energy = potential_energy + kinetic_energy + external_force
 
         # Dynamic threshold based on volatility
-        threshold = (self.data['Volatility'].rolling(window=20).mean() *
-                     self.params['price_threshold']).astype(float)
+        threshold = (volatility_mean * self.params['price_threshold']).astype(float)
 
         # Generate trading signals using vectorized operations
         energy_change = total_energy.diff().fillna(0)
@@ -87,22 +92,10 @@ class HamiltonianStrategy(BaseStrategy):
         signals.loc[energy_change > threshold, 'Position'] = 1
         signals.loc[energy_change < -threshold, 'Position'] = -1
 
-        # Forward fill positions (maintain previous position when no new signal)
-        signals['Position'] = signals['Position'].fillna(
-            method='ffill').fillna(0)
-
-        # Add position holding logic
-        for i in range(1, len(signals)):
-            prev_position = signals['Position'].iloc[i-1]
-            curr_position = signals['Position'].iloc[i]
-
-            # Only change position if signal is different from current position
-            if curr_position == 0:  # No new signal
-                signals['Position'].iloc[i] = prev_position
-            elif (prev_position == 1 and curr_position == 1) or \
-                 (prev_position == -1 and curr_position == -1):
-                # Maintain current position
-                signals['Position'].iloc[i] = prev_position
+        # Hold the previous position when there is no new signal: bars
+        # without a signal become NaN and take the last signal forward
+        signals['Position'] = signals['Position'].replace(
+            0, np.nan).ffill().fillna(0).astype(int)
 
         return signals
 
@@ -116,7 +109,7 @@ class HamiltonianStrategy(BaseStrategy):
 
         # Add transaction costs (0.1% per trade)
         portfolio['Trade'] = portfolio['Position'].diff().fillna(
-            0).abs() * 0.001
+            0).abs() * self.TRADE_COST
 
         # Calculate returns with transaction costs
         portfolio['Holdings'] = portfolio['Position'] * portfolio['Close']
@@ -158,3 +151,101 @@ class HamiltonianStrategy(BaseStrategy):
         }
 
         return metrics
+
+    def sweep_positions(self, grid: np.ndarray) -> np.ndarray:
+        """
+        Positions generate_signals would produce for many parameter sets
+
+        Args:
+            grid: (combinations x 4) rows of damping, friction,
+                external_influence and price_threshold
+
+        Returns:
+            (combinations x bars) int8 positions
+        """
+        price_diff, momentum, trend, volatility_mean = (
+            component.to_numpy(dtype=float)[None, :]
+            for component in self._energy_components())
+        damping, friction, external_influence, price_threshold = (
+            grid[:, i, None] for i in range(4))
+
+        # Same operation order as generate_signals, so results are identical
+        total_energy = (price_diff * (1 - damping) + momentum * (1 - friction)
+                        + trend * external_influence)
+        energy_change = np.zeros_like(total_energy)
+        energy_change[:, 1:] = np.diff(total_energy, axis=1)
+        np.nan_to_num(energy_change, copy=False, nan=0.0)
+        threshold = volatility_mean * price_threshold
+
+        raw = np.where(energy_change > threshold, 1,
+                       np.where(energy_change < -threshold, -1, 0)).astype(np.int8)
+
+        # Forward fill the last non-zero signal along each row
+        last_signal = np.where(raw != 0, np.arange(raw.shape[1]), 0)
+        np.maximum.accumulate(last_signal, axis=1, out=last_signal)
+        return np.take_along_axis(raw, last_signal, axis=1)
+
+    def parameter_sweep(self,
+                        damping: Sequence[float],
+                        friction: Sequence[float],
+                        external_influence: Sequence[float],
+                        price_threshold: Sequence[float],
+                        initial_capital: float = 100000,
+                        chunk_size: int = 250) -> pd.DataFrame:
+        """
+        Metrics for every combination of the given parameter values
+
+        The indicators are computed once and shared; each chunk of
+        combinations is evaluated as (combinations x bars) array operations
+        instead of re-running the strategy per combination.
+
+        Args:
+            damping, friction, external_influence, price_threshold: Values
+                to combine (full Cartesian product)
+            initial_capital: Starting portfolio value, as in backtest()
+            chunk_size: Combinations evaluated at once (memory is
+                chunk_size * bars per intermediate array)
+
+        Returns:
+            One row per combination with its parameters and the
+            calculate_metrics metrics
+        """
+        grid = np.array(list(product(damping, friction, external_influence,
+                                     price_threshold)), dtype=float)
+        metrics = []
+        for start in range(0, len(grid), chunk_size):
+            chunk = grid[start:start + chunk_size]
+            strategy_returns = self.batch_strategy_returns(
+                self.sweep_positions(chunk), self.TRADE_COST)
+            metrics.append(np.column_stack(
+                self._sweep_metrics(strategy_returns, initial_capital)))
+
+        results = pd.DataFrame(grid, columns=self.SWEEP_PARAMETERS)
+        results[['Total Return', 'Annual Return', 'Volatility',
+                 'Sharpe Ratio', 'Max Drawdown']] = np.concatenate(metrics)
+        return results
+
+    def _sweep_metrics(self, strategy_returns: np.ndarray,
+                       initial_capital: float) -> Tuple[np.ndarray, ...]:
+        """calculate_metrics for each row of strategy returns"""
+        missing = np.isnan(strategy_returns)
+        returns = np.where(missing, 0.0, strategy_returns)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # cumprod skips NaN returns but leaves NaN values in place
+            growth = np.cumprod(np.where(missing, 1.0, 1 + strategy_returns), axis=1)
+            portfolio_value = np.where(missing, np.nan, growth * initial_capital)
+            total_return = (portfolio_value[:, -1] / portfolio_value[:, 0] - 1) * 100
+
+            mean = returns.mean(axis=1)
+            std = returns.std(axis=1, ddof=1)
+            annual_return = mean * 252 * 100
+            volatility = std * np.sqrt(252) * 100
+            sharpe_ratio = np.where(std != 0, (mean * 252) / (std * np.sqrt(252)), 0)
+
+            rolling_max = np.fmax.accumulate(portfolio_value, axis=1)
+            drawdowns = (portfolio_value - rolling_max) / rolling_max
+            max_drawdown = np.nanmin(np.where(np.isnan(drawdowns), np.inf, drawdowns),
+                                     axis=1) * 100
+
+        return total_return, annual_return, volatility, sharpe_ratio, max_drawdown
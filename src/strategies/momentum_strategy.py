@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from typing import Optional, Sequence, Tuple
 from .base_strategy import BaseStrategy
 
 
@@ -22,3 +23,43 @@ class MomentumStrategy(BaseStrategy):
                                        np.where(momentum < -self.threshold, -1, 0))
 
         return signals
+
+    def momentum_matrix(self, lookbacks: Sequence[int]) -> np.ndarray:
+        """
+        pct_change(lookback) of Close for many lookbacks at once
+
+        Each row divides two shifted views of the same price array straight
+        into the output, so no shifted copies of the prices are made.
+
+        Returns:
+            (lookbacks x bars) momentum, NaN for the first lookback bars
+        """
+        close = self.data['Close'].to_numpy(dtype=float)
+        momentum = np.full((len(lookbacks), len(close)), np.nan)
+        for row, lookback in zip(momentum, lookbacks):
+            if lookback < len(close):
+                np.divide(close[lookback:], close[:-lookback], out=row[lookback:])
+                row[lookback:] -= 1
+        return momentum
+
+    def batch_backtest(self, lookbacks: Sequence[int],
+                       threshold: Optional[float] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Positions and Strategy_Returns of backtest() for every lookback
+
+        Args:
+            lookbacks: Lookback periods to evaluate
+            threshold: Signal threshold (defaults to the strategy's)
+
+        Returns:
+            Positions and strategy returns, each a bars x lookbacks DataFrame
+        """
+        threshold = self.threshold if threshold is None else threshold
+        momentum = self.momentum_matrix(lookbacks)
+        positions = np.where(momentum > threshold, 1,
+                             np.where(momentum < -threshold, -1, 0))
+        strategy_returns = self.batch_strategy_returns(positions)
+
+        columns = pd.Index(lookbacks, name='lookback_period')
+        return (pd.DataFrame(positions.T, index=self.data.index, columns=columns),
+                pd.DataFrame(strategy_returns.T, index=self.data.index, columns=columns))
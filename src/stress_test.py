@@ -0,0 +1,223 @@
+import os
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.strategies.strategy_factory import StrategyFactory
+
+# (start, end) dates, both inclusive
+Window = Tuple[str, str]
+
+DEFAULT_WINDOWS: Dict[str, Window] = {
+    'dot_com_crash': ('2000-03-10', '2002-10-09'),
+    'global_financial_crisis': ('2007-10-09', '2009-03-09'),
+    'flash_crash_2010': ('2010-05-03', '2010-07-02'),
+    'us_downgrade_2011': ('2011-07-22', '2011-10-03'),
+    'china_devaluation_2015': ('2015-08-10', '2015-09-30'),
+    'volmageddon_2018': ('2018-01-26', '2018-02-28'),
+    'q4_selloff_2018': ('2018-09-20', '2018-12-24'),
+    'covid_crash': ('2020-02-19', '2020-03-23'),
+    'rate_shock_2022': ('2022-01-03', '2022-10-12'),
+}
+
+METRICS = ['Total Return', 'Annual Return', 'Volatility', 'Sharpe Ratio', 'Max Drawdown']
+
+
+def load_price_history(symbol: str, start_date: str, end_date: str,
+                       cache_dir: str = 'cache/prices') -> pd.DataFrame:
+    """Download daily prices once and reuse the pickled copy afterwards"""
+    path = os.path.join(cache_dir, f'{symbol}_{start_date}_{end_date}.pkl')
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+
+    data = yf.download(symbol, start=start_date, end=end_date)
+    if data.empty:
+        raise ValueError("No data fetched. Please check symbol and dates.")
+    os.makedirs(cache_dir, exist_ok=True)
+    data.to_pickle(path)
+    return data
+
+
+def window_metrics(returns: np.ndarray, bounds: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    BaseStrategy.calculate_metrics for many windows of one return series
+
+    Windows are laid out as rows of a zero-padded matrix so every metric is
+    a single reduction over all of them. Equity starts at 1 at the close
+    before each window, so the first bar's return counts toward the total
+    return and drawdown.
+
+    Args:
+        returns: Per-bar strategy returns (NaNs count as zero)
+        bounds: (start, stop) row ranges, stop exclusive
+
+    Returns:
+        (windows x METRICS) array in percent, like calculate_metrics
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=float), nan=0.0)
+    starts = np.array([start for start, _ in bounds])
+    lengths = np.array([stop - start for start, stop in bounds])
+    width = max(int(lengths.max()), 1)
+
+    offsets = np.arange(width)
+    valid = offsets < lengths[:, None]
+    rows = np.minimum(starts[:, None] + offsets, len(returns) - 1)
+    padded = np.where(valid, returns[rows], 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = padded.sum(axis=1) / lengths
+        deviations = np.where(valid, padded - mean[:, None], 0.0)
+        std = np.sqrt((deviations ** 2).sum(axis=1) / (lengths - 1))
+
+        # Zero padding leaves equity flat after each window ends
+        equity = np.cumprod(1 + padded, axis=1)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+        max_drawdown = (equity / peak - 1).min(axis=1)
+
+        sharpe = np.where(std != 0, (mean * 252) / (std * np.sqrt(252)), 0.0)
+        metrics = np.column_stack([
+            (equity[:, -1] - 1) * 100,
+            mean * 252 * 100,
+            std * np.sqrt(252) * 100,
+            sharpe,
+            max_drawdown * 100
+        ])
+
+    return np.nan_to_num(metrics, nan=0.0)
+
+
+def _strategy_returns(strategy_type: str, params: Dict[str, Any],
+                      data: pd.DataFrame) -> np.ndarray:
+    """Run a strategy's own backtest on data and return its per-bar returns"""
+    strategy = StrategyFactory.create_strategy(strategy_type, params)
+    strategy.set_data(data)
+    portfolio = strategy.backtest()
+    return portfolio['Strategy_Returns'].to_numpy(dtype=float)
+
+
+def _run_window(strategy_type: str, params: Dict[str, Any],
+                data: pd.DataFrame, skip: int) -> np.ndarray:
+    """Worker: backtest one window slice (with warmup rows) independently"""
+    return _strategy_returns(strategy_type, params, data)[skip:]
+
+
+class StressTester:
+    """Replay a strategy through named historical windows
+
+    In batched mode the strategy is backtested once over the whole cached
+    history and every window is a slice of that return series, so signals
+    carry their state into each window. In pool mode each window (plus
+    warmup bars for the indicators) is backtested independently across a
+    process pool. Results are cached per window, so adding a window only
+    evaluates the new one.
+    """
+
+    def __init__(self,
+                 strategy_type: str,
+                 params: Dict[str, Any],
+                 data: pd.DataFrame,
+                 windows: Optional[Dict[str, Window]] = None,
+                 warmup: int = 100,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            strategy_type: StrategyFactory strategy type
+            params: Strategy parameters (symbol and dates default to the data's)
+            data: Cached daily prices covering the windows, as fetch_data returns
+            windows: Named (start, end) windows; defaults to DEFAULT_WINDOWS
+            warmup: Bars before each window fed to the strategy in pool mode
+            max_workers: Worker processes for pool mode
+        """
+        self.strategy_type = strategy_type
+        self.data = data.sort_index()
+        self.params = {
+            'symbol': '',
+            'start_date': str(self.data.index[0].date()),
+            'end_date': str(self.data.index[-1].date()),
+            **params
+        }
+        self.windows: Dict[str, Window] = dict(
+            DEFAULT_WINDOWS if windows is None else windows)
+        self.warmup = warmup
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self._results: Dict[str, np.ndarray] = {}
+        self._full_returns: Optional[np.ndarray] = None
+
+    def add_window(self, name: str, start: str, end: str,
+                   mode: str = 'batched') -> pd.Series:
+        """Register a window and evaluate only it"""
+        self.windows[name] = (start, end)
+        self._results.pop(name, None)
+        return self.run(mode).loc[name]
+
+    def run(self, mode: str = 'batched') -> pd.DataFrame:
+        """
+        Evaluate every window not yet in the cache
+
+        Args:
+            mode: 'batched' (one backtest over the full history) or 'pool'
+                (independent backtests per window across processes)
+
+        Returns:
+            DataFrame with one row per window: its dates, number of bars and
+            the calculate_metrics metrics. Windows with no data are NaN.
+        """
+        if mode not in ('batched', 'pool'):
+            raise ValueError(f"Unsupported stress test mode: {mode}")
+
+        bounds = {name: self._bounds(start, end)
+                  for name, (start, end) in self.windows.items()}
+        pending = [name for name in self.windows
+                   if name not in self._results and bounds[name][1] > bounds[name][0]]
+
+        if pending and mode == 'batched':
+            self._evaluate_batched(pending, bounds)
+        elif pending:
+            self._evaluate_pool(pending, bounds)
+
+        rows = []
+        for name, (start, end) in self.windows.items():
+            metrics = self._results.get(name, np.full(len(METRICS), np.nan))
+            rows.append({'Window': name, 'Start': start, 'End': end,
+                         'Bars': bounds[name][1] - bounds[name][0],
+                         **dict(zip(METRICS, metrics))})
+
+        return pd.DataFrame(rows).set_index('Window')
+
+    def _bounds(self, start: str, end: str) -> Tuple[int, int]:
+        """Row range of the cached data inside [start, end]"""
+        index = self.data.index
+        return (int(index.searchsorted(pd.Timestamp(start), side='left')),
+                int(index.searchsorted(pd.Timestamp(end), side='right')))
+
+    def _evaluate_batched(self, names: List[str],
+                          bounds: Dict[str, Tuple[int, int]]) -> None:
+        if self._full_returns is None:
+            self._full_returns = _strategy_returns(
+                self.strategy_type, self.params, self.data)
+
+        metrics = window_metrics(self._full_returns, [bounds[name] for name in names])
+        self._results.update(zip(names, metrics))
+
+    def _evaluate_pool(self, names: List[str],
+                       bounds: Dict[str, Tuple[int, int]]) -> None:
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for name in names:
+                start, stop = bounds[name]
+                first = max(0, start - self.warmup)
+                futures.append(executor.submit(
+                    _run_window, self.strategy_type, self.params,
+                    self.data.iloc[first:stop], start - first))
+            window_returns = [future.result() for future in futures]
+
+        # Windows are now separate series laid end to end
+        lengths = np.array([len(returns) for returns in window_returns])
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        metrics = window_metrics(
+            np.concatenate(window_returns),
+            [(int(offsets[i]), int(offsets[i + 1])) for i in range(len(names))])
+        self._results.update(zip(names, metrics))
@@ -0,0 +1,100 @@
+import numpy as np
+from typing import Any
+
+TREE_LEAF = -1
+
+
+class FlatForest:
+    """Tree ensemble flattened into contiguous NumPy arrays
+
+    All trees share one set of node arrays. Leaves point to themselves, so
+    evaluation is a fixed number of vectorized steps (the deepest tree's
+    depth) over every (tree, row) pair with no per-node Python branching.
+    Predictions match scikit-learn's RandomForestClassifier bit for bit:
+    inputs are rounded to float32 and per-tree probabilities are summed in
+    tree order, exactly as sklearn does.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray,
+                 left: np.ndarray, right: np.ndarray, missing_left: np.ndarray,
+                 values: np.ndarray, roots: np.ndarray, classes: np.ndarray,
+                 depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.values = values
+        self.roots = roots
+        self.classes = classes
+        self.depth = depth
+
+    @classmethod
+    def from_sklearn(cls, forest: Any) -> 'FlatForest':
+        """Export a fitted single-output RandomForestClassifier"""
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be exported")
+
+        features, thresholds, lefts, rights, missing, values, roots = \
+            [], [], [], [], [], [], []
+        offset = 0
+        depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            nodes = np.arange(n_nodes)
+            is_leaf = tree.children_left == TREE_LEAF
+
+            # Leaves loop back to themselves and test a harmless feature
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            missing.append(getattr(tree, 'missing_go_to_left',
+                                   np.zeros(n_nodes, dtype=np.uint8)).astype(bool))
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer[:, None])
+
+            roots.append(offset)
+            offset += n_nodes
+            depth = max(depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            missing_left=np.concatenate(missing),
+            values=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.array(roots, dtype=np.intp),
+            classes=forest.classes_,
+            depth=depth
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities for a single row (1-D) or a small batch (2-D)"""
+        # sklearn evaluates splits on float32 inputs
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        rows = np.arange(X.shape[0])[None, :]
+        node = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+
+        for _ in range(self.depth):
+            x = X[rows, self.feature[node]]
+            go_left = (x <= self.threshold[node]) | \
+                (np.isnan(x) & self.missing_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        # Summing over the tree axis adds trees in order, like sklearn
+        return self.values[node].sum(axis=0) / len(self.roots)
+
+    def predict(self, X) -> np.ndarray:
+        """Predicted class labels"""
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
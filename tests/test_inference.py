@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.inference import BatchingPredictor
+from src.models import TradingModel
+from tests.test_models import make_training_data
+
+
+class FailOnNegative:
+    """predict_proba stub that rejects any batch containing a negative value"""
+
+    feature_columns = None
+
+    def predict_proba(self, X):
+        values = np.asarray(X, dtype=float)
+        if (values < 0).any():
+            raise ValueError("negative input")
+        return np.column_stack([1 - values[:, 0], values[:, 0]])
+
+
+def test_submit_rejects_rows_of_the_wrong_width():
+    X, y = make_training_data()
+    model = TradingModel({'model': {'n_estimators': 10}})
+    model.train(X, y)
+
+    with BatchingPredictor(model, max_wait_ms=50) as predictor:
+        good = predictor.submit(X.to_numpy()[:2])
+        with pytest.raises(ValueError):
+            predictor.submit(np.ones((2, 3)))
+        with pytest.raises(ValueError):
+            predictor.submit(None)
+        with pytest.raises(ValueError):
+            predictor.submit(X[['a', 'b']])
+
+        np.testing.assert_allclose(good.result(5), model.predict_proba(X.iloc[:2]))
+
+
+def test_failed_batch_only_fails_the_offending_request():
+    with BatchingPredictor(FailOnNegative(), max_wait_ms=50) as predictor:
+        futures = [predictor.submit(np.array([[value, 0.0]]))
+                   for value in (0.25, -1.0, 0.75)]
+
+        assert futures[0].result(5)[0, 1] == 0.25
+        with pytest.raises(ValueError):
+            futures[1].result(5)
+        assert futures[2].result(5)[0, 1] == 0.75
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from src.models import TradingModel
+
+
+def make_training_data(n_rows: int = 500, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=['a', 'b', 'c', 'd'])
+    y = (X['a'] > 0).astype(int)
+    return X, y
+
+
+def test_update_online_model_loaded_from_registry(tmp_path):
+    """Artifacts load memory-mapped read-only; update() must still work"""
+    config = {'model': {'type': 'online', 'artifact_dir': str(tmp_path)}}
+    X, y = make_training_data()
+
+    TradingModel(config).train(X, y)
+
+    reloaded = TradingModel(config)
+    reloaded.train(X, y)
+    trained_fingerprint = reloaded.fingerprint
+    coef_before = np.array(reloaded.model.model_.coef_)
+
+    reloaded.update(X.iloc[:50], y.iloc[:50])
+
+    assert reloaded.fingerprint != trained_fingerprint
+    assert not np.array_equal(reloaded.model.model_.coef_, coef_before)
+    assert reloaded.predict(X).shape == (len(X),)
+
+
+def test_binned_model_retrained_on_new_values_with_same_index():
+    """Cached bin codes must not be reused for rows whose values changed"""
+    config = {'model': {'type': 'hist_gradient_boosting'}}
+    X_old, y_old = make_training_data(seed=1)
+    X_new, y_new = make_training_data(seed=2)
+
+    retrained = TradingModel(config)
+    retrained.train(X_old, y_old)
+    retrained.train(X_new, y_new)
+
+    fresh = TradingModel(config)
+    fresh.train(X_new, y_new)
+
+    np.testing.assert_array_equal(retrained.predict(X_new), fresh.predict(X_new))
+
+
+def test_fingerprint_depends_on_feature_selection_config(tmp_path):
+    X, y = make_training_data()
+    fingerprints = set()
+    for selection in ({}, {'enabled': True, 'min_importance': 0.01},
+                      {'enabled': True, 'min_importance': 0.2}):
+        model = TradingModel({'model': {'n_estimators': 10, 'artifact_dir': str(tmp_path),
+                                        'feature_selection': selection}})
+        model.train(X, y)
+        fingerprints.add(model.fingerprint)
+
+    assert len(fingerprints) == 3
+
+
+def test_prediction_cache_misses_rows_with_different_values(tmp_path):
+    """Same timestamps with other feature values (e.g. another symbol) are not served from cache"""
+    config = {'model': {'n_estimators': 10,
+                        'prediction_cache': {'path': str(tmp_path)}}}
+    X, y = make_training_data()
+    timestamps = pd.date_range('2024-01-01', periods=len(X), freq='h')
+    model = TradingModel(config)
+    model.train(X.set_axis(timestamps), y.set_axis(timestamps))
+
+    first = model.predict(X.set_axis(timestamps))
+    other_symbol = -X.set_axis(timestamps)
+    np.testing.assert_array_equal(model.predict(other_symbol),
+                                  model.model.predict(other_symbol))
+    np.testing.assert_array_equal(model.predict(X.set_axis(timestamps)), first)
+
+
+def test_update_online_model_after_feature_selection():
+    """update() must use only the features kept when training"""
+    config = {'model': {'type': 'online',
+                        'feature_selection': {'enabled': True, 'min_importance': 0.1}}}
+    X, y = make_training_data()
+    model = TradingModel(config)
+    model.train(X, y)
+    assert len(model.feature_columns) < X.shape[1]
+
+    model.update(X.iloc[-100:], y.iloc[-100:])
+
+    assert model.predict(X).shape == (len(X),)
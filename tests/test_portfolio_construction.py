@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.portfolio_construction import risk_parity_weights
+
+
+def make_covariances(n_dates: int = 30, n_assets: int = 20, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(size=(n_dates, n_assets, 3))
+    volatility = rng.uniform(0.005, 0.05, (n_dates, n_assets))
+    return 1e-4 * loadings @ loadings.transpose(0, 2, 1) + \
+        np.einsum('bi,ij->bij', volatility ** 2, np.eye(n_assets))
+
+
+def test_risk_parity_weights_long_only_with_unequal_budgets():
+    """Unequal budgets must not converge to a stationary point with negative weights"""
+    covariances = make_covariances()
+    budgets = np.random.default_rng(1).uniform(0.05, 1, covariances.shape[1])
+
+    weights = risk_parity_weights(covariances, budgets)
+
+    assert (weights > 0).all()
+    contributions = weights * np.einsum('bij,bj->bi', covariances, weights)
+    np.testing.assert_allclose(contributions / contributions.sum(axis=1, keepdims=True),
+                               np.broadcast_to(budgets / budgets.sum(), weights.shape),
+                               atol=1e-10)